@@ -0,0 +1,74 @@
+"""JSON-file TTL cache that survives between runs."""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class DiskTTLCache:
+    """
+    String-keyed cache persisted to a JSON file, with per-entry expiry.
+
+    Meant for small JSON-serializable values reused across runs (the workflows
+    commit data/*.json). Expiry uses wall-clock time since entries outlive the
+    process. Safe to share between threads.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> [expires_at, value]; read from disk on first use
+        self._data: dict[str, list[Any]] | None = None
+
+    def _load(self) -> dict[str, list[Any]]:
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    raw = json.load(f)
+            except (OSError, ValueError):
+                raw = {}  # Missing or corrupt file: start empty
+
+            now = time.time()
+            self._data = {
+                key: entry
+                for key, entry in raw.items()
+                if isinstance(entry, list) and len(entry) == 2 and entry[0] > now
+            }
+        return self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None or entry[0] <= time.time():
+                return default
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value and rewrite the file, dropping expired entries."""
+        with self._lock:
+            data = self._load()
+            now = time.time()
+            data[key] = [now + (self.ttl if ttl is None else ttl), value]
+            for stale in [k for k, (expires_at, _) in data.items() if expires_at <= now]:
+                del data[stale]
+            self._save(data)
+
+    def _save(self, data: dict[str, list[Any]]) -> None:
+        """Write to a temp file and swap it in, so a crash never leaves a partial file."""
+        directory = os.path.dirname(self.path)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not write cache file %s: %s", self.path, e)
@@ -0,0 +1,23 @@
+"""JSON encoding/decoding that uses orjson when it is installed, else the stdlib."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; not a required dependency
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode a JSON document from raw response bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a request body as compact UTF-8 JSON (the same bytes httpx's json= sends)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
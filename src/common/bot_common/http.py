@@ -0,0 +1,107 @@
+"""Shared keep-alive HTTP client and retrying requests for async callers."""
+
+import asyncio
+import importlib.util
+
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Concurrent requests allowed per host, so a burst never floods one API or feed
+MAX_PER_HOST = 8
+# Tighter caps for rate-limited APIs; see set_host_limit
+_host_limit_overrides: dict[str, int] = {}
+# Rate limiting and server-side failures are worth retrying; other 4xx are not
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+# Per-host semaphores for the current loop (asyncio primitives are loop-bound)
+_host_limits: dict[str, asyncio.Semaphore] = {}
+_host_limits_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide AsyncClient for the running event loop.
+
+    Every async caller on the loop shares one connection pool, so each host
+    pays DNS/TCP/TLS setup once per run. An AsyncClient is bound to the loop it
+    first runs on, so a new one is created when the running loop changes.
+    Callers must not close it; the owner of the loop calls aclose_async_client().
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(timeout=30.0, limits=_LIMITS, http2=HTTP2_AVAILABLE)
+        _client_loop = loop
+    return _client
+
+
+async def aclose_async_client() -> None:
+    """Close the shared client (call before its event loop shuts down)."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
+
+
+def set_host_limit(host: str, limit: int) -> None:
+    """Cap concurrent requests to `host` at `limit` instead of MAX_PER_HOST."""
+    _host_limit_overrides[host] = max(1, limit)
+    # Rebuilt with the new limit on next use
+    _host_limits.pop(host, None)
+
+
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    """Semaphore capping concurrent requests to one host on the running loop."""
+    global _host_limits_loop
+    loop = asyncio.get_running_loop()
+    if _host_limits_loop is not loop:
+        _host_limits.clear()
+        _host_limits_loop = loop
+    semaphore = _host_limits.get(host)
+    if semaphore is None:
+        limit = _host_limit_overrides.get(host, MAX_PER_HOST)
+        semaphore = _host_limits[host] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Retry network errors/timeouts and 429/5xx responses, give up on anything else."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+@retry(
+    retry=retry_if_exception(_is_transient),
+    stop=stop_after_attempt(4),
+    wait=wait_exponential_jitter(initial=1, max=10),
+    reraise=True,
+)
+async def request_with_backoff(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs
+) -> httpx.Response:
+    """
+    Send a request under the per-host limit and return the read response.
+
+    Transient failures (network errors, 429/5xx) are retried up to 4 attempts
+    with jittered exponential backoff; other error statuses raise immediately.
+
+    Raises:
+        httpx.HTTPError: If the request still fails after retrying.
+    """
+    async with (
+        _host_semaphore(httpx.URL(url).host),
+        client.stream(method, url, **kwargs) as response,
+    ):
+        # Raised before the body is downloaded
+        response.raise_for_status()
+        await response.aread()
+    return response
@@ -0,0 +1,60 @@
+"""Persistent event loop behind the sync wrappers of async clients."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import Any, TypeVar
+
+from bot_common.http import aclose_async_client
+
+T = TypeVar("T")
+
+
+class LoopRunner:
+    """
+    Runs coroutines for sync callers on one reused event loop.
+
+    Reusing one loop (instead of asyncio.run per call) keeps loop-bound
+    connection pools, including the shared client from bot_common.http, alive
+    between sync calls. Call close() when done. Not for use from a thread that
+    is already running an event loop; async callers await the coroutines directly.
+    """
+
+    def __init__(self, owner: str) -> None:
+        # Named in the error raised when called from inside a running loop
+        self._owner = owner
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        """The loop created by the first run(), or None before that / after close()."""
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine to completion on the persistent loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coro.close()  # Never awaited; close it to avoid the "never awaited" warning
+            raise RuntimeError(
+                f"{self._owner} sync methods cannot run inside an event loop; "
+                "await the *_async variant instead"
+            )
+
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def close(self, aclose: Callable[[], Awaitable[None]] | None = None) -> None:
+        """Await `aclose` (the owner's client cleanup) on the loop, then close it."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            if aclose is not None:
+                self._loop.run_until_complete(aclose())
+            # This loop is ours, so is the shared client bound to it
+            self._loop.run_until_complete(aclose_async_client())
+        finally:
+            self._loop.close()
+            self._loop = None
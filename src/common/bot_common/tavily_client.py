@@ -1,38 +1,57 @@
 """Shared Tavily API Client."""
 
+import asyncio
+import json
 import logging
 import os
+from collections.abc import Sequence
 from typing import Any
 
 import httpx
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from bot_common import fast_json
+from bot_common.http import get_async_client, request_with_backoff, set_host_limit
 
 logger = logging.getLogger(__name__)
 
+# Searches in flight at once across every TavilyClient, to stay under the
+# plan's rate limit instead of burning time on 429 retries
+MAX_CONCURRENCY = int(os.getenv("TAVILY_MAX_CONCURRENCY", "4"))
+
 
 class TavilyClient:
     """Client for Tavily Search API."""
 
     BASE_URL = "https://api.tavily.com/search"
+    HOST = "api.tavily.com"
+    # Advanced searches can take a while to answer, but a connect that hangs is
+    # better failed fast and retried by request_with_backoff
+    TIMEOUT = httpx.Timeout(30.0, connect=3.0)
 
-    def __init__(self, api_key: str | None = None) -> None:
+    def __init__(self, api_key: str | None = None, client: httpx.AsyncClient | None = None) -> None:
         self.api_key = api_key or os.getenv("TAVILY_API_KEY")
         if not self.api_key:
             logger.warning("TAVILY_API_KEY not found. Search will be disabled.")
 
-    @retry(
-        retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True,
-    )
+        # Injected client is owned by the caller; otherwise the process-wide
+        # keep-alive client for the running loop is used
+        self._client = client
+        # Identical searches in flight share one request (keyed by payload), with
+        # the number of callers still waiting on it
+        self._inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self._waiters: dict[asyncio.Task[dict[str, Any]], int] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the injected client, or the shared one for the running event loop."""
+        return self._client or get_async_client()
+
     async def search(
         self,
         query: str,
         search_depth: str = "basic",
         max_results: int = 5,
-        include_domains: list[str] | None = None,
-        exclude_domains: list[str] | None = None,
+        include_domains: Sequence[str] | None = None,
+        exclude_domains: Sequence[str] | None = None,
         include_answer: bool = False,
         include_raw_content: bool = False,
         include_images: bool = False,
@@ -54,7 +73,9 @@ class TavilyClient:
                   E.g., days=30 returns news from the last 30 days.
 
         Returns:
-            JSON response from Tavily API.
+            JSON response from Tavily API. Concurrent calls with identical
+            arguments share one request and receive the same response object;
+            the request is cancelled once every caller waiting on it is.
         """
         if not self.api_key:
             return {"results": []}
@@ -70,17 +91,49 @@ class TavilyClient:
         }
 
         if include_domains:
-            payload["include_domains"] = include_domains
+            payload["include_domains"] = list(include_domains)
         if exclude_domains:
-            payload["exclude_domains"] = exclude_domains
+            payload["exclude_domains"] = list(exclude_domains)
         if days is not None:
             payload["topic"] = "news"
             payload["days"] = days
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.BASE_URL, json=payload, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
+        key = json.dumps(payload, sort_keys=True)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._post(payload))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shield so one cancelled caller does not cancel the request for the others
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Every caller gave up: stop the request rather than orphan it
+                    self._forget(key, task)
+                    task.cancel()
+
+    def _forget(self, key: str, task: asyncio.Task[dict[str, Any]]) -> None:
+        """Drop the in-flight entry for key if it still belongs to task."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """POST a search payload, retrying transient failures with backoff."""
+        response = await request_with_backoff(
+            self._get_client(),
+            "POST",
+            self.BASE_URL,
+            content=fast_json.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=self.TIMEOUT,
+        )
+        return fast_json.loads(response.content)
 
     async def get_search_context(
         self,
@@ -123,5 +176,8 @@ class TavilyClient:
             return "\n\n".join(context_parts)
 
         except Exception as e:
-            logger.error(f"Tavily search context failed: {e}")
+            logger.error("Tavily search context failed: %s", e)
             return ""
+
+
+set_host_limit(TavilyClient.HOST, MAX_CONCURRENCY)
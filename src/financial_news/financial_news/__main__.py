@@ -1,18 +1,30 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from bot_common.disk_cache import DiskTTLCache
+from bot_common.http import aclose_async_client
 
 from .feed_manager import FeedManager
 from .fmarket_client import FmarketClient
-from .market_enricher import MarketEnricher
 from .news_enricher import NewsEnricher
-from .notifier import send_discord_webhook
-from .stock_client import StockClient
+from .notifier import send_discord_webhook_async
 from .summarizer import NewsSummarizer
 
+if TYPE_CHECKING:
+    from .stock_client import StockClient
+
 # Setup Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Configuration
 # Users should set these in their .env or environment
 VIETNAM_FEED_URLS = [
@@ -26,8 +38,91 @@ GLOBAL_FEED_URLS = [
     "https://www.investing.com/rss/news.rss",
 ]
 
+# Political news items passed to the summarizer
+POLITICAL_SUMMARY_ITEMS = 10
 
-def main():
+# AI summaries reused by reruns within 15 minutes (cron overlap, manual retries).
+# The workflow carries this file between runs in the Actions cache, not in git.
+SUMMARY_CACHE = DiskTTLCache("data/summary_cache.json", ttl=900)
+
+
+def _summary_cache_key(news: list[dict[str, Any]], vn30_current: dict[str, Any]) -> str:
+    """Hash of the headlines and VN30 level: same news on the same market -> same briefing."""
+    canonical = json.dumps(
+        {
+            "titles": [item.get("title") for item in news],
+            "vn30": vn30_current.get("current"),
+            "change": vn30_current.get("change_percent"),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _env_flag(name: str) -> bool:
+    """True unless the variable is set to 0/false/no/off."""
+    return os.getenv(name, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Optional pipeline stages; a disabled stage's modules are never imported."""
+
+    enable_vn30: bool = True
+    enable_political: bool = True
+    enable_market_context: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        """Read FINANCIAL_NEWS_VN30 / _POLITICAL / _MARKET_CONTEXT (all on by default)."""
+        return cls(
+            enable_vn30=_env_flag("FINANCIAL_NEWS_VN30"),
+            enable_political=_env_flag("FINANCIAL_NEWS_POLITICAL"),
+            enable_market_context=_env_flag("FINANCIAL_NEWS_MARKET_CONTEXT"),
+        )
+
+
+async def _skipped(value: T) -> T:
+    """Stand-in result for a disabled stage inside asyncio.gather."""
+    return value
+
+
+def _dedupe_news(news: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Drop repeated stories, keeping the first occurrence.
+
+    An item is a repeat if its link was already kept, or if its title matches a
+    kept title once case, punctuation and spacing are ignored.
+    """
+    seen_links: set[str] = set()
+    seen_titles: set[str] = set()
+    unique = []
+    for item in news:
+        link = item.get("link") or ""
+        title_key = re.sub(r"\W+", "", (item.get("title") or "").lower())[:80]
+        if (link and link in seen_links) or (title_key and title_key in seen_titles):
+            continue
+        if link:
+            seen_links.add(link)
+        if title_key:
+            seen_titles.add(title_key)
+        unique.append(item)
+    return unique
+
+
+def _fetch_vn30(
+    stock_client: "StockClient",
+) -> tuple[dict[str, Any], list[str], dict[str, Any]]:
+    """VN30 index, components and top movers (movers reuse the cached components)."""
+    vn30_current = stock_client.get_vn30_index()
+    vn30_symbols = list(stock_client.get_vn30_symbols())
+    vn30_top_movers = stock_client.get_vn30_top_movers(limit=5)
+    return vn30_current, vn30_symbols, vn30_top_movers
+
+
+async def main_async(config: PipelineConfig | None = None):
+    config = config or PipelineConfig.from_env()
     webhook_url = os.getenv("DISCORD_WEBHOOK_FINANCE")
     if not webhook_url:
         logger.error("Environment variable DISCORD_WEBHOOK_FINANCE is not set.")
@@ -37,67 +132,93 @@ def main():
 
     feed_manager = FeedManager()
     fmarket_client = FmarketClient()
+    enricher = NewsEnricher()
 
-    # Fetch Vietnam News
-    vn_news = feed_manager.fetch_feeds(VIETNAM_FEED_URLS)
-    logger.info(f"Fetched {len(vn_news)} Vietnamese news items.")
+    if config.enable_vn30:
+        from .stock_client import StockClient
 
-    # Fetch Global News
-    global_news = feed_manager.fetch_feeds(GLOBAL_FEED_URLS)
-    logger.info(f"Fetched {len(global_news)} Global news items.")
+        stock_client = StockClient(source="VCI")
+        vn30_task = asyncio.to_thread(_fetch_vn30, stock_client)
+        # SSI supplements DSC with foreign flow, order book
+        ssi_task = asyncio.to_thread(stock_client.get_vn30_ssi_data)
+    else:
+        vn30_task = _skipped(({}, [], {}))
+        ssi_task = _skipped({})
 
-    # Fetch Fmarket News
-    fmarket_news = fmarket_client.get_market_news()
-    logger.info(f"Fetched {len(fmarket_news)} Fmarket news items.")
+    if config.enable_political:
+        political_task = enricher.search_political_news_async(
+            max_topics=5,  # Search top 5 topics
+            max_results_per_topic=3,
+            # Only this many reach the summary; stop searching once they are in
+            max_items=POLITICAL_SUMMARY_ITEMS,
+        )
+    else:
+        political_task = _skipped([])
 
-    # Fetch Market Data
-    # Enhanced: Sort by 12-month return for long-term view
-    top_funds = fmarket_client.get_top_funds(
-        limit=20, include_holdings=True, sort_field="navTo12Months"
-    )
-    watchlist_funds = fmarket_client.get_funds_by_codes(
-        ["DCDS", "DCDE", "BVFED", "VESAF", "SSISCA", "E1VFVN30"]
+    # Every source below is independent I/O, so fetch them all at once; the
+    # sync clients run on worker threads.
+    logger.info("Fetching news, fund, gold, VN30 and political data concurrently...")
+    (
+        vn_news,
+        global_news,
+        fmarket_news,
+        top_funds,
+        watchlist_funds,
+        gold_prices,
+        bank_rates,
+        (vn30_current, vn30_symbols, vn30_top_movers),
+        ssi_vn30,
+        political_news,
+    ) = await asyncio.gather(
+        feed_manager.fetch_feeds_async(VIETNAM_FEED_URLS),
+        feed_manager.fetch_feeds_async(GLOBAL_FEED_URLS),
+        asyncio.to_thread(fmarket_client.get_market_news),
+        # Enhanced: Sort by 12-month return for long-term view
+        asyncio.to_thread(
+            fmarket_client.get_top_funds,
+            limit=20,
+            include_holdings=True,
+            sort_field="navTo12Months",
+        ),
+        asyncio.to_thread(
+            fmarket_client.get_funds_by_codes,
+            ["DCDS", "DCDE", "BVFED", "VESAF", "SSISCA", "E1VFVN30"],
+        ),
+        asyncio.to_thread(fmarket_client.get_gold_prices),
+        asyncio.to_thread(fmarket_client.get_bank_rates),
+        vn30_task,
+        ssi_task,
+        political_task,
     )
-    logger.info(f"Fetched {len(watchlist_funds)} watchlist funds.")
-
-    gold_prices = fmarket_client.get_gold_prices()
-    bank_rates = fmarket_client.get_bank_rates()
 
-    # Fetch VN30 Stock Data
-    logger.info("Fetching VN30 data...")
-    stock_client = StockClient(source="VCI")
-    vn30_current = stock_client.get_vn30_index()
-    vn30_symbols = list(stock_client.get_vn30_symbols())
-    vn30_top_movers = stock_client.get_vn30_top_movers(limit=5)
+    logger.info("Fetched %d Vietnamese news items.", len(vn_news))
+    logger.info("Fetched %d Global news items.", len(global_news))
+    logger.info("Fetched %d Fmarket news items.", len(fmarket_news))
+    logger.info("Fetched %d watchlist funds.", len(watchlist_funds))
 
-    # Fetch SSI VN30 Data (supplements DSC with foreign flow, order book)
-    logger.info("Fetching SSI VN30 data...")
-    ssi_vn30 = stock_client.get_vn30_ssi_data()
-    if ssi_vn30.get("index"):
+    if not config.enable_vn30:
+        logger.info("VN30 stage disabled.")
+    elif ssi_vn30.get("index"):
+        index = ssi_vn30["index"]
         logger.info(
-            f"SSI VN30: {ssi_vn30['index']['value']:.2f} "
-            f"({ssi_vn30['index']['change_percent']:+.2f}%), "
-            f"Advances: {ssi_vn30['index']['advances']}, "
-            f"Declines: {ssi_vn30['index']['declines']}"
+            "SSI VN30: %.2f (%+.2f%%), Advances: %s, Declines: %s",
+            index["value"],
+            index["change_percent"],
+            index["advances"],
+            index["declines"],
         )
     else:
         logger.warning("SSI VN30 data unavailable, continuing with DSC data only")
 
     logger.info(
-        f"VN30 Index: {vn30_current.get('current', 'N/A')} ({vn30_current.get('change_percent', 0):+.2f}%)"
+        "VN30 Index: %s (%+.2f%%)",
+        vn30_current.get("current", "N/A"),
+        vn30_current.get("change_percent", 0),
     )
-
-    # Fetch Political/Policy News
-    logger.info("Fetching political/policy news about stocks and funds...")
-    enricher = NewsEnricher()
-    political_news = enricher.search_political_news(
-        max_topics=5,  # Search top 5 topics
-        max_results_per_topic=3,
-    )
-    logger.info(f"Fetched {len(political_news)} political news items.")
+    logger.info("Fetched %d political news items.", len(political_news))
 
     # Combine News (including political news)
-    combined_news = fmarket_news + vn_news[:5] + global_news[:5]
+    combined_news = _dedupe_news(fmarket_news + vn_news[:5] + global_news[:5])
 
     if not combined_news and not political_news:
         logger.info("No news found.")
@@ -105,10 +226,12 @@ def main():
 
     # Enrich News (Top 3 items)
     logger.info("Enriching top news with Web Context...")
-    combined_news = enricher.enrich_news_items(combined_news, limit=3)
+    combined_news = await enricher.enrich_news_items_async(combined_news, limit=3)
 
     # Build initial market stats
-    political_context = enricher.format_political_news_for_summary(political_news, limit=10)
+    political_context = enricher.format_political_news_for_summary(
+        political_news, limit=POLITICAL_SUMMARY_ITEMS
+    )
     market_stats = {
         "top_funds": top_funds,
         "watchlist_funds": watchlist_funds,
@@ -123,24 +246,50 @@ def main():
     }
 
     # Enrich Market Data with Perplexity
-    logger.info("Enriching market data with Perplexity...")
-    market_enricher = MarketEnricher()
-    perplexity_context = market_enricher.enrich_market_stats(market_stats)
+    if config.enable_market_context:
+        from .market_enricher import MarketEnricher
+
+        logger.info("Enriching market data with Perplexity...")
+        market_enricher = MarketEnricher()
+        try:
+            perplexity_context = await market_enricher.enrich_market_stats_async(market_stats)
+        finally:
+            await market_enricher.aclose()
 
-    # Add Perplexity context to market_stats for summarizer
-    market_stats["perplexity_context"] = perplexity_context
+        # Add Perplexity context to market_stats for summarizer
+        market_stats["perplexity_context"] = perplexity_context
 
-    logger.info(f"Sending {len(combined_news)} items to Discord...")
+    logger.info("Sending %d items to Discord...", len(combined_news))
 
     # Generate Summary
     logger.info("Generating AI Summary...")
     summarizer = NewsSummarizer()
 
-    summary_text = summarizer.summarize(combined_news, market_stats)
+    cache_key = _summary_cache_key(combined_news, vn30_current)
+    summary_text = SUMMARY_CACHE.get(cache_key)
+    if summary_text is not None:
+        logger.info("Reusing AI summary from a recent run with the same inputs.")
+    else:
+        summary_text = await asyncio.to_thread(summarizer.summarize, combined_news, market_stats)
+        # Only cache real AI output; the no-key fallback is cheap to rebuild
+        if summary_text and summarizer.api_key:
+            SUMMARY_CACHE.set(cache_key, summary_text)
 
-    send_discord_webhook(webhook_url, combined_news, summary_text)
+    await send_discord_webhook_async(webhook_url, combined_news, summary_text)
     logger.info("Done.")
 
 
+async def _run_pipeline() -> None:
+    """Run main_async, then close the shared HTTP client before the loop ends."""
+    try:
+        await main_async()
+    finally:
+        await aclose_async_client()
+
+
+def main():
+    asyncio.run(_run_pipeline())
+
+
 if __name__ == "__main__":
     main()
@@ -4,6 +4,8 @@ No rate limits, provides real-time intraday data.
 """
 
 import logging
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Any
 
@@ -11,6 +13,9 @@ import httpx
 
 logger = logging.getLogger(__name__)
 
+# Cap on concurrent per-symbol requests when the batch quote call misses symbols
+MAX_FALLBACK_WORKERS = 12
+
 
 @dataclass
 class IndexData:
@@ -66,7 +71,7 @@ class DSCClient:
             data = response.json()
 
             if data.get("s") != "ok":
-                logger.error(f"DSC API error: {data.get('em')}")
+                logger.error("DSC API error: %s", data.get("em"))
                 return {}
 
             result = {}
@@ -123,7 +128,7 @@ class DSCClient:
             return result
 
         except Exception as e:
-            logger.error(f"Error fetching index data: {e}")
+            logger.error("Error fetching index data: %s", e)
             return {}
 
     def get_stock_price(self, symbol: str) -> StockData | None:
@@ -209,7 +214,7 @@ class DSCClient:
             )
 
         except Exception as e:
-            logger.error(f"Error fetching stock {symbol}: {e}")
+            logger.error("Error fetching stock %s: %s", symbol, e)
             return None
 
     def get_stock_prices(self, symbols: list[str]) -> dict[str, StockData]:
@@ -256,19 +261,33 @@ class DSCClient:
                                 last_update="",
                             )
 
-            # Fill missing with individual calls (fallback)
-            for sym in symbols:
-                if sym not in result:
-                    stock = self.get_stock_price(sym)
-                    if stock:
-                        result[sym] = stock
+            # Fill missing with individual calls (fallback), overlapping the round-trips
+            missing = list(dict.fromkeys(sym for sym in symbols if sym not in result))
+            if missing:
+                result.update(self._fetch_stock_prices_parallel(missing))
 
             return result
 
         except Exception as e:
-            logger.error(f"Error fetching batch stocks: {e}")
+            logger.error("Error fetching batch stocks: %s", e)
             return {}
 
+    def _fetch_stock_prices_parallel(self, symbols: list[str]) -> dict[str, StockData]:
+        """Fetch symbols one by one on a thread pool; failed symbols are left out."""
+        result = {}
+        with ThreadPoolExecutor(max_workers=min(len(symbols), MAX_FALLBACK_WORKERS)) as executor:
+            futures = {executor.submit(self.get_stock_price, sym): sym for sym in symbols}
+            for future in as_completed(futures):
+                sym = futures[future]
+                try:
+                    stock = future.result()
+                except Exception as e:
+                    logger.error("Error fetching stock %s: %s", sym, e)
+                    continue
+                if stock:
+                    result[sym] = stock
+        return result
+
     def get_vn30_symbols(self) -> list[str]:
         """Get list of VN30 index component symbols."""
         try:
@@ -279,13 +298,19 @@ class DSCClient:
                 return data.get("d", [])
             return []
         except Exception as e:
-            logger.error(f"Error fetching VN30 symbols: {e}")
+            logger.error("Error fetching VN30 symbols: %s", e)
             return []
 
-    def get_stock_info(self, symbol: str) -> dict[str, Any] | None:
+    def get_stock_info(
+        self, symbol: str, vn30_symbols: Collection[str] | None = None
+    ) -> dict[str, Any] | None:
         """
         Fetch stock fundamental info (Market Cap, Industry, Company Name).
         Note: P/E, EPS, ROE might be missing or defaulted to 0 as DSC doesn't provide them explicitly in public API.
+
+        Args:
+            symbol: Stock symbol.
+            vn30_symbols: Known VN30 components; fetched from the API when omitted.
         """
         try:
             # Fetch all instruments if not cached (naive caching)
@@ -310,6 +335,8 @@ class DSCClient:
             market_cap_billion = (listed_shares * close_price) / 1e9
 
             industry = self._industry_cache.get(symbol.upper(), "Unknown")
+            if vn30_symbols is None:
+                vn30_symbols = self.get_vn30_symbols()
 
             return {
                 "symbol": symbol.upper(),
@@ -321,12 +348,11 @@ class DSCClient:
                 "pb_ratio": 0.0,
                 "eps": 0.0,
                 "roe": 0.0,
-                "is_vn30": symbol.upper()
-                in self.get_vn30_symbols(),  # This effectively calls API again, maybe cache it too
+                "is_vn30": symbol.upper() in vn30_symbols,
             }
 
         except Exception as e:
-            logger.error(f"Error getting stock info for {symbol}: {e}")
+            logger.error("Error getting stock info for %s: %s", symbol, e)
             return None
 
     def _fetch_all_instruments(self):
@@ -344,7 +370,7 @@ class DSCClient:
                         if sym:
                             self._instruments_cache[sym] = item
             except Exception as e:
-                logger.warning(f"Failed to fetch instruments for {exc}: {e}")
+                logger.warning("Failed to fetch instruments for %s: %s", exc, e)
 
     def _fetch_all_industries(self):
         """Fetch industry mapping."""
@@ -361,4 +387,4 @@ class DSCClient:
                         if code:
                             self._industry_cache[code.strip()] = ind_name
         except Exception as e:
-            logger.warning(f"Failed to fetch industries: {e}")
+            logger.warning("Failed to fetch industries: %s", e)
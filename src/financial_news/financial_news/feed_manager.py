@@ -1,54 +1,97 @@
+import asyncio
+import calendar
 import datetime
-import time
+from operator import itemgetter
 from typing import Any
 
 import feedparser
 import httpx
+from bot_common.http import get_async_client, request_with_backoff
 from bs4 import BeautifulSoup
 
 
 class FeedManager:
-    def __init__(self):
-        pass
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        # Used by fetch_feeds_async; defaults to the process-wide shared client
+        self._client = client
 
     def fetch_feeds(self, feed_urls: list[str]) -> list[dict[str, Any]]:
         all_news = []
         for url in feed_urls:
             try:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-                response = httpx.get(url, headers=headers, timeout=30.0)
-                response.raise_for_status()
-
-                feed = feedparser.parse(response.content)
-                if feed.bozo:
-                    # Ignore bozo errors which are just warnings usually
-                    pass
-                    # print(f"Error parsing feed {url}: {feed.bozo_exception}")
-                    # continue
-
-                for entry in feed.entries:
-                    news_item = self._parse_entry(entry, feed.feed.get("title", "Unknown Source"))
-                    if news_item:
-                        all_news.append(news_item)
+                # Stream so a failed status is raised before the body is downloaded
+                with httpx.stream("GET", url, headers=self.HEADERS, timeout=30.0) as response:
+                    response.raise_for_status()
+                    body = response.read()
+
+                all_news.extend(self._parse_feed(body))
             except Exception as e:
                 print(f"Error fetching {url}: {e}")
 
         # Sort by published date, newest first
-        all_news.sort(key=lambda x: x["published_at"], reverse=True)
+        all_news.sort(key=itemgetter("published_at"), reverse=True)
         return all_news
 
+    async def fetch_feeds_async(self, feed_urls: list[str]) -> list[dict[str, Any]]:
+        """Like fetch_feeds, but all feeds are downloaded concurrently."""
+        client = self._client or get_async_client()
+        feeds = await asyncio.gather(*(self._fetch_feed_async(client, url) for url in feed_urls))
+
+        all_news = [item for items in feeds for item in items]
+        # Sort by published date, newest first
+        all_news.sort(key=itemgetter("published_at"), reverse=True)
+        return all_news
+
+    async def _fetch_feed_async(self, client: httpx.AsyncClient, url: str) -> list[dict[str, Any]]:
+        try:
+            response = await request_with_backoff(
+                client, "GET", url, headers=self.HEADERS, timeout=30.0
+            )
+            body = response.content
+
+            # feedparser and BeautifulSoup are CPU-bound; keep them off the event loop
+            return await asyncio.to_thread(self._parse_feed, body)
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return []
+
+    def _parse_feed(self, body: bytes) -> list[dict[str, Any]]:
+        feed = feedparser.parse(body)
+
+        if feed.bozo:
+            # Ignore bozo errors which are just warnings usually
+            pass
+            # print(f"Error parsing feed {url}: {feed.bozo_exception}")
+            # continue
+
+        source_name = feed.feed.get("title", "Unknown Source")
+        news = []
+        for entry in feed.entries:
+            news_item = self._parse_entry(entry, source_name)
+            if news_item:
+                news.append(news_item)
+        return news
+
     def _parse_entry(self, entry: Any, source_name: str) -> dict[str, Any] | None:
         try:
             # Handle different date formats
+            # feedparser normalizes parsed dates to UTC struct_time, so use timegm
+            # (mktime would wrongly treat them as local time)
             published_at = None
             if hasattr(entry, "published_parsed") and entry.published_parsed:
-                published_at = datetime.datetime.fromtimestamp(time.mktime(entry.published_parsed))
+                published_at = datetime.datetime.fromtimestamp(
+                    calendar.timegm(entry.published_parsed), tz=datetime.UTC
+                )
             elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
-                published_at = datetime.datetime.fromtimestamp(time.mktime(entry.updated_parsed))
+                published_at = datetime.datetime.fromtimestamp(
+                    calendar.timegm(entry.updated_parsed), tz=datetime.UTC
+                )
             else:
-                published_at = datetime.datetime.now()  # Fallback
+                published_at = datetime.datetime.now(datetime.UTC)  # Fallback
 
             raw_summary = entry.get("summary", "")
             summary = self._clean_html(raw_summary)
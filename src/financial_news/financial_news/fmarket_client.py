@@ -1,15 +1,78 @@
+import bisect
 import datetime
+import heapq
 import json
 import logging
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Any
 
 import httpx
+from bot_common import fast_json
+from bot_common.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Shared body of every /products/filter request; callers override paging/sort/search
+_FILTER_PAYLOAD_BASE = MappingProxyType(
+    {
+        "types": ["NEW_FUND", "TRADING_FUND"],
+        "issuerIds": [],
+        "sortOrder": "DESC",
+        "sortField": "navTo6Months",
+        "page": 1,
+        "pageSize": 5,
+        "isIpo": False,
+        "fundAssetTypes": [],  # All types
+        "bondRemainPeriods": [],
+        "searchField": "",
+        "isBuyByReward": False,
+        "thirdAppIds": [],
+    }
+)
+
+# Fund detail fields merged into a filter row
+_DETAIL_FIELDS = ("top_holdings", "asset_allocation", "industry_allocation")
+
+# Slow-moving market data (gold, bank rates, fund rankings) shared by every
+# client in the process, so repeated lookups within a run hit the network once
+_MARKET_CACHE = TTLCache(maxsize=64)
+
+# The gold history window only moves once a day; see _gold_date_range
+_DATE_CACHE: dict[str, Any] = {}
+
+
+def _write_json_atomic(path: str, data: Any, **dump_kwargs: Any) -> None:
+    """Write JSON to a temp file and swap it in, so a crash never leaves a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, **dump_kwargs)
+    os.replace(tmp_path, path)
+
+
+def _gold_date_range() -> tuple[datetime.date, datetime.date, str, str]:
+    """(today, start, today_str, start_str) of the 365-day gold history window."""
+    today = datetime.date.today()
+    if _DATE_CACHE.get("day") != today:
+        start = today - datetime.timedelta(days=365)
+        _DATE_CACHE["day"] = today
+        _DATE_CACHE["range"] = (today, start, today.isoformat(), start.isoformat())
+    return _DATE_CACHE["range"]
+
+
+def _rate_value(bank: dict[str, Any]) -> float:
+    """Numeric rate of a bankList entry; the API sends it as a string."""
+    value = bank.get("value")
+    try:
+        return float(value) if value else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
 
 class FmarketClient:
     """
@@ -23,8 +86,34 @@ class FmarketClient:
         "Accept": "application/json",
     }
 
-    def __init__(self):
-        self.client = httpx.Client(headers=self.HEADERS, timeout=30.0)
+    # VNAppMob keys live 15 days; refresh after 14 to be safe
+    VNAPPMOB_KEY_TTL = 14 * 24 * 3600
+    # Fund details change at most daily; the rest is kept in _MARKET_CACHE
+    FUND_DETAIL_TTL = 900
+    GOLD_TTL = 1800
+    BANK_RATES_TTL = 6 * 3600
+    TOP_FUNDS_TTL = 3600
+    # Large enough for the whole Fmarket fund list to fit in one filter page
+    BULK_PAGE_SIZE = 100
+
+    def __init__(self, client: httpx.Client | None = None):
+        # An injected client is owned by the caller and must send HEADERS itself.
+        # Limits live on the transport (httpx ignores Client limits when a transport
+        # is given); retries only cover connection failures, not HTTP errors.
+        self.client = client or httpx.Client(
+            headers=self.HEADERS,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.HTTPTransport(
+                retries=2,
+                limits=httpx.Limits(
+                    max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0
+                ),
+            ),
+        )
+        # (key, created_at) of the last loaded VNAppMob key
+        self._cached_key: tuple[str, float] | None = None
+        self._key_lock = threading.Lock()
+        self._detail_cache = TTLCache(maxsize=512, ttl=self.FUND_DETAIL_TTL)
 
     def get_fund_detail(self, product_id: int) -> dict[str, Any]:
         """
@@ -37,12 +126,16 @@ class FmarketClient:
             Dictionary with fund details including top_holdings, asset_allocation,
             and industry_allocation.
         """
+        cached = self._detail_cache.get(product_id)
+        if cached is not None:
+            return dict(cached)
+
         url = f"{self.BASE_URL}/products/{product_id}"
 
         try:
             response = self.client.get(url)
             response.raise_for_status()
-            data = response.json()
+            data = fast_json.loads(response.content)
 
             if "data" not in data:
                 return {}
@@ -83,7 +176,7 @@ class FmarketClient:
                     }
                 )
 
-            return {
+            detail = {
                 "id": product.get("id"),
                 "name": product.get("shortName"),
                 "full_name": product.get("name"),
@@ -93,71 +186,97 @@ class FmarketClient:
                 "asset_allocation": asset_allocation,
                 "industry_allocation": industry_allocation,
             }
+            self._detail_cache.set(product_id, detail)
+            return dict(detail)
 
         except Exception as e:
-            logger.error(f"Error fetching fund detail for product {product_id}: {e}")
+            logger.error("Error fetching fund detail for product %s: %s", product_id, e)
             return {}
 
     def search_funds(self, query: str, limit: int = 5) -> list[dict[str, Any]]:
         """
         Search for funds by name or code.
         """
-        url = f"{self.BASE_URL}/products/filter"
-        payload = {
-            "types": ["NEW_FUND", "TRADING_FUND"],
-            "issuerIds": [],
-            "sortOrder": "DESC",
-            "sortField": "navTo6Months",
-            "page": 1,
-            "pageSize": limit,
-            "isIpo": False,
-            "fundAssetTypes": [],
-            "bondRemainPeriods": [],
-            "searchField": query,
-            "isBuyByReward": False,
-            "thirdAppIds": [],
-        }
-
         try:
-            response = self.client.post(url, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            if "data" in data and "rows" in data["data"]:
-                funds = []
-                for row in data["data"]["rows"]:
-                    funds.append(self._parse_fund_row(row))
-                return funds
-            return []
+            return self._filter_funds(pageSize=limit, searchField=query)
         except Exception as e:
-            logger.error(f"Error searching funds with query '{query}': {e}")
+            logger.error("Error searching funds with query '%s': %s", query, e)
             return []
 
+    def _filter_funds(self, **overrides: Any) -> list[dict[str, Any]]:
+        """
+        POST /products/filter with the shared payload and parse the rows.
+
+        Args:
+            overrides: Payload keys replacing those of _FILTER_PAYLOAD_BASE.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+        """
+        payload = {**_FILTER_PAYLOAD_BASE, **overrides}
+        response = self.client.post(f"{self.BASE_URL}/products/filter", json=payload)
+        response.raise_for_status()
+        data = fast_json.loads(response.content)
+
+        if "data" in data and "rows" in data["data"]:
+            return [self._parse_fund_row(row) for row in data["data"]["rows"]]
+        return []
+
+    def _enrich_with_detail(self, fund: dict[str, Any]) -> dict[str, Any]:
+        """Merge holdings and allocations from the fund's (cached) detail into it."""
+        if fund.get("id"):
+            detail = self.get_fund_detail(fund["id"])
+            if detail:
+                for key in _DETAIL_FIELDS:
+                    fund[key] = detail.get(key, [])
+        return fund
+
     def get_funds_by_codes(self, codes: list[str]) -> list[dict[str, Any]]:
         """
         Fetch specific funds by their codes.
-        Since there's no direct bulk get by code, we search for each.
+
+        One unfiltered listing resolves most codes by exact short name; only
+        codes missing from it fall back to a per-code search. Detail lookups
+        run concurrently; results keep the order of `codes`.
         """
-        results = []
-        for code in codes:
-            # increasing limit slightly in case of partial matches, though exact code usually comes first
-            funds = self.search_funds(code, limit=5)
-            # Filter for exact match or close match if needed
-            # For now, take the first one that matches the code in shortName if possible
-            found = None
-            for f in funds:
-                if code.upper() in f["name"].upper():
-                    found = f
-                    break
-
-            if found:
-                # enrich with detailed holdings
-                detail = self.get_fund_detail(found["id"])
-                if detail:
-                    found["top_holdings"] = detail.get("top_holdings", [])
-                    found.update(detail)  # Merge details
-                results.append(found)
-        return results
+        if not codes:
+            return []
+
+        by_code: dict[str, dict[str, Any]] = {}
+        try:
+            for fund in self._filter_funds(pageSize=self.BULK_PAGE_SIZE):
+                by_code.setdefault((fund.get("name") or "").upper(), fund)
+        except Exception as e:
+            logger.warning("Bulk fund listing failed, searching per code: %s", e)
+
+        def resolve(code: str) -> dict[str, Any] | None:
+            found = by_code.get(code.upper())
+            if found is None:
+                return self._find_fund_by_code(code)
+            # Copy: a code may repeat, and enrichment mutates the row
+            return self._enrich_with_detail(dict(found))
+
+        with ThreadPoolExecutor(max_workers=min(len(codes), 8)) as executor:
+            found_funds = list(executor.map(resolve, codes))
+
+        return [fund for fund in found_funds if fund]
+
+    def _find_fund_by_code(self, code: str) -> dict[str, Any] | None:
+        """Search for one fund code and merge in its detailed holdings."""
+        # increasing limit slightly in case of partial matches, though exact code usually comes first
+        funds = self.search_funds(code, limit=5)
+        # Filter for exact match or close match if needed
+        # For now, take the first one that matches the code in shortName if possible
+        found = None
+        for f in funds:
+            if code.upper() in f["name"].upper():
+                found = f
+                break
+
+        if found:
+            # enrich with detailed holdings
+            self._enrich_with_detail(found)
+        return found
 
     def _parse_fund_row(self, row: dict[str, Any]) -> dict[str, Any]:
         """Helper to parse a fund row from search/filter response."""
@@ -167,15 +286,17 @@ class FmarketClient:
         elif row.get("dataFundAssetType"):
             fund_type = row["dataFundAssetType"].get("name")
 
+        nav_change = row.get("productNavChange") or {}
+
         return {
             "id": row.get("id"),
             "name": row.get("shortName"),
             "full_name": row.get("name"),
             "nav": row.get("nav"),
-            "nav_12m": row.get("productNavChange", {}).get("navTo12Months"),
-            "nav_ytd": row.get("productNavChange", {}).get("navToLastYear"),
-            "nav_6m": row.get("productNavChange", {}).get("navTo6Months"),
-            "nav_3y": row.get("productNavChange", {}).get("navTo36Months"),
+            "nav_12m": nav_change.get("navTo12Months"),
+            "nav_ytd": nav_change.get("navToLastYear"),
+            "nav_6m": nav_change.get("navTo6Months"),
+            "nav_3y": nav_change.get("navTo36Months"),
             "type": fund_type,
         }
 
@@ -192,46 +313,26 @@ class FmarketClient:
             limit: Maximum number of funds to return.
             include_holdings: If True, fetch detailed holdings for each fund.
             sort_field: Field to sort by (e.g., 'navTo12Months', 'navTo6Months').
+
+        Non-empty results are reused for TOP_FUNDS_TTL seconds.
         """
-        url = f"{self.BASE_URL}/products/filter"
-        payload = {
-            "types": ["NEW_FUND", "TRADING_FUND"],
-            "issuerIds": [],
-            "sortOrder": "DESC",
-            "sortField": sort_field,
-            "page": 1,
-            "pageSize": limit,
-            "isIpo": False,
-            "fundAssetTypes": [],  # All types
-            "bondRemainPeriods": [],
-            "searchField": "",
-            "isBuyByReward": False,
-            "thirdAppIds": [],
-        }
+        cache_key = f"top_funds|{limit}|{include_holdings}|{sort_field}"
+        cached = _MARKET_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
 
         try:
-            response = self.client.post(url, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            if "data" in data and "rows" in data["data"]:
-                funds = []
-                for row in data["data"]["rows"]:
-                    fund_data = self._parse_fund_row(row)
-
-                    # Optionally fetch detailed holdings
-                    if include_holdings and row.get("id"):
-                        detail = self.get_fund_detail(row["id"])
-                        if detail:
-                            fund_data["top_holdings"] = detail.get("top_holdings", [])
-                            fund_data["asset_allocation"] = detail.get("asset_allocation", [])
-                            fund_data["industry_allocation"] = detail.get("industry_allocation", [])
-
-                    funds.append(fund_data)
-                return funds
-            return []
+            funds = self._filter_funds(sortField=sort_field, pageSize=limit)
+
+            # Optionally fetch detailed holdings, overlapping the per-fund requests
+            if include_holdings and funds:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    funds = list(executor.map(self._enrich_with_detail, funds))
+            if funds:
+                _MARKET_CACHE.set(cache_key, funds, ttl=self.TOP_FUNDS_TTL)
+            return list(funds)
         except Exception as e:
-            logger.error(f"Error fetching top funds: {e}")
+            logger.error("Error fetching top funds: %s", e)
             return []
 
     def get_gold_prices(self) -> dict[str, Any]:
@@ -240,7 +341,14 @@ class FmarketClient:
         - Vietnam (SJC, Ring): vnappmob API
         - World: freegoldapi
         - History: vnappmob with caching
+
+        The three sources are independent, so they are fetched concurrently.
+        Results with at least one price are reused for GOLD_TTL seconds.
         """
+        cached = _MARKET_CACHE.get("gold")
+        if cached is not None:
+            return dict(cached)
+
         result = {
             "sjc_buy": 0.0,
             "sjc_sell": 0.0,
@@ -251,58 +359,67 @@ class FmarketClient:
             "history": [],
         }
 
-        # 1. Fetch Vietnam Gold Data (SJC & Ring)
+        # Both vnappmob calls share one key lookup; a stale key is refreshed on 403
         try:
-            # Get cached or fresh API Key
             api_key = self._get_vnappmob_key()
-
+        except Exception as e:
+            logger.error("Error loading VNAppMob API key: %s", e)
+            api_key = ""
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            vn_future = executor.submit(self._fetch_vn_gold, api_key)
+            world_future = executor.submit(self._fetch_world_gold)
+            history_future = executor.submit(self._fetch_gold_history, api_key)
+
+            result.update(vn_future.result())
+            result["world_gold"] = world_future.result()
+            result["history"] = history_future.result()
+
+        # Don't pin a total outage in the cache for half an hour
+        if result["sjc_sell"] or result["ring_sell"] or result["world_gold"]:
+            _MARKET_CACHE.set("gold", result, ttl=self.GOLD_TTL)
+        return dict(result)
+
+    def _fetch_vn_gold(self, api_key: str) -> dict[str, float]:
+        """Fetch latest Vietnam gold prices (SJC & Ring) from vnappmob."""
+        prices: dict[str, float] = {}
+        try:
             # vnappmob v2 SJC endpoint
             vn_url = "https://api.vnappmob.com/api/v2/gold/sjc"
-            headers = {"Authorization": f"Bearer {api_key}"}
-
-            resp = self.client.get(vn_url, headers=headers)
-
-            if resp.status_code == 403:
-                # Key might be expired, force refresh (delete cache and retry once)
-                logger.warning("VNAppMob Key expired (403). Refreshing key...")
-                api_key = self._get_vnappmob_key(force_refresh=True)
-                headers = {"Authorization": f"Bearer {api_key}"}
-                resp = self.client.get(vn_url, headers=headers)
-
+            resp = self._get_vnappmob(vn_url, api_key)
             resp.raise_for_status()
-            data = resp.json()
+            data = fast_json.loads(resp.content)
 
             # Structure expectation: {'results': [{'buy_1l': ..., 'sell_1l': ..., 'buy_nhan1c': ..., ...}]}
             if "results" in data and len(data["results"]) > 0:
                 latest = data["results"][0]
                 # Price is already in full VND (e.g. 178000000.0), do NOT multiply by 1000.
-                result["sjc_buy"] = float(latest.get("buy_1l", 0))
-                result["sjc_sell"] = float(latest.get("sell_1l", 0))
-                result["ring_buy"] = float(latest.get("buy_nhan1c", 0))
-                result["ring_sell"] = float(latest.get("sell_nhan1c", 0))
+                prices["sjc_buy"] = float(latest.get("buy_1l", 0))
+                prices["sjc_sell"] = float(latest.get("sell_1l", 0))
+                prices["ring_buy"] = float(latest.get("buy_nhan1c", 0))
+                prices["ring_sell"] = float(latest.get("sell_nhan1c", 0))
 
         except Exception as e:
-            logger.error(f"Error fetching Vietnam gold prices: {e}")
+            logger.error("Error fetching Vietnam gold prices: %s", e)
 
-        # 2. Fetch World Gold
+        return prices
+
+    def _fetch_world_gold(self) -> float:
+        """Fetch world gold price (USD/oz) from freegoldapi. Returns 0.0 on failure."""
         try:
             world_url = "https://freegoldapi.com/data/latest.json"
-            # Try freegoldapi (might default to USD/oz)
-            # Or use explicit currency if supported e.g. /data/XAU/USD/latest.json
-            # Simplest fallback: calculate if not easy.
-            # actually freegoldapi requires no key? Let's try.
-            # If it fails, leave as 0.
-            w_resp = self.client.get(world_url)  # type safe
+            w_resp = self.client.get(world_url)
             if w_resp.status_code == 200:
                 # Expecting {"price": 1234.56, ...}
-                w_data = w_resp.json()
-                result["world_gold"] = float(w_data.get("price", 0))
+                w_data = fast_json.loads(w_resp.content)
+                return float(w_data.get("price", 0))
         except Exception:
-            # logger.error(f"Error fetching World gold: {e}")
             # Silent fail for secondary data
             pass
+        return 0.0
 
-        # 3. History with Caching
+    def _fetch_gold_history(self, api_key: str) -> list[dict[str, Any]]:
+        """Load the cached SJC history, fetch any missing days and return the last 365 days."""
         try:
             cache_dir = "data"
             os.makedirs(cache_dir, exist_ok=True)
@@ -318,11 +435,8 @@ class FmarketClient:
                 except Exception:
                     history_data = []  # Corrupt cache
 
-            today = datetime.datetime.now()
-            today_str = today.strftime("%Y-%m-%d")
-
-            # Determine start date
-            start_date = today - datetime.timedelta(days=365)
+            # Window bounds (start_date is also the return cutoff)
+            today, start_date, today_str, start_str = _gold_date_range()
 
             if not history_data:
                 fetch_from = start_date
@@ -331,28 +445,24 @@ class FmarketClient:
                 history_data.sort(key=lambda x: x.get("date", ""))
                 last_entry = history_data[-1]
                 try:
-                    last_date = datetime.datetime.strptime(last_entry.get("date"), "%Y-%m-%d")
+                    last_date = datetime.date.fromisoformat(last_entry.get("date"))
                     fetch_from = last_date + datetime.timedelta(days=1)
-                except ValueError:
+                except (TypeError, ValueError):
                     fetch_from = start_date
 
-            if fetch_from < today:
+            if fetch_from <= today:
                 # Fetch missing data
                 from_s = fetch_from.strftime("%Y-%m-%d")
                 to_s = today_str
 
                 # Only fetch if gap exists
                 if from_s <= to_s:
-                    # Need API Key for history too?
                     # Docs say: "Authorization – Bearer <api_key|scope=gold|permission=0>"
-                    # Assuming same key works.
-                    api_key = self._get_vnappmob_key()
+                    # so the same key as the latest-price call works.
                     h_url = f"https://api.vnappmob.com/api/v2/gold/sjc?date_from={from_s}&date_to={to_s}"
-                    headers = {"Authorization": f"Bearer {api_key}"}
-
-                    h_resp = self.client.get(h_url, headers=headers)
+                    h_resp = self._get_vnappmob(h_url, api_key)
                     if h_resp.status_code == 200:
-                        h_json = h_resp.json()
+                        h_json = fast_json.loads(h_resp.content)
                         new_items = []
                         if "results" in h_json:
                             for item in h_json["results"]:
@@ -378,15 +488,14 @@ class FmarketClient:
                                         }
                                     )
 
-                        # Merge and Deduplicate
-                        # Use dict to dedupe by date
-                        hist_map = {x["date"]: x for x in history_data}
-                        for ni in new_items:
-                            hist_map[ni["date"]] = ni
+                        # Merge and Deduplicate by date (new items win)
+                        hist_map = {
+                            **{x["date"]: x for x in history_data},
+                            **{ni["date"]: ni for ni in new_items},
+                        }
 
                         # Re-convert to list and sort
-                        full_hist = list(hist_map.values())
-                        full_hist.sort(key=lambda x: x["date"])
+                        full_hist = sorted(hist_map.values(), key=itemgetter("date"))
 
                         # Trim to 365 days to avoid unlimited growth
                         # actually cache can grow, but result returned should be limited?
@@ -394,26 +503,51 @@ class FmarketClient:
 
                         history_data = full_hist
 
-                        # Save Cache
-                        with open(cache_file, "w") as f:
-                            json.dump(history_data, f, indent=2)
+                        # Save Cache (indented: the file is committed by the workflow)
+                        _write_json_atomic(cache_file, history_data, indent=2)
 
             # Filter result history to last 365 days for return
-            cutoff = (today - datetime.timedelta(days=365)).strftime("%Y-%m-%d")
-            result["history"] = [x for x in history_data if x["date"] >= cutoff]
+            # (history_data is sorted by date, so bisect to the cutoff)
+            idx = bisect.bisect_left(history_data, start_str, key=itemgetter("date"))
+            return history_data[idx:]
 
         except Exception as e:
-            logger.error(f"Error processing gold history: {e}")
+            logger.error("Error processing gold history: %s", e)
+
+        return []
 
-        return result
+    def _get_vnappmob(self, url: str, api_key: str) -> httpx.Response:
+        """GET a vnappmob endpoint, refreshing the key and retrying once on 403."""
+        resp = self.client.get(url, headers={"Authorization": f"Bearer {api_key}"})
+        if resp.status_code == 403:
+            # Key might be expired, force refresh (delete cache and retry once)
+            logger.warning("VNAppMob Key expired (403). Refreshing key...")
+            api_key = self._refresh_vnappmob_key(api_key)
+            resp = self.client.get(url, headers={"Authorization": f"Bearer {api_key}"})
+        return resp
+
+    def _refresh_vnappmob_key(self, stale_key: str) -> str:
+        """
+        Replace a rejected key. Concurrent callers holding the same stale key
+        share one refresh instead of each requesting a new key.
+        """
+        with self._key_lock:
+            if self._cached_key and self._cached_key[0] != stale_key:
+                return self._cached_key[0]  # Another thread already refreshed it
+            return self._get_vnappmob_key(force_refresh=True)
 
     def _get_vnappmob_key(self, force_refresh: bool = False) -> str:
         """
         Get VNAppMob API Key.
-        - Check data/vnappmob_key.json
+        - Check the in-memory key, then data/vnappmob_key.json
         - If missing/expired or force_refresh is True, request new key.
         - Cache key.
         """
+        if not force_refresh and self._cached_key:
+            key, created_at = self._cached_key
+            if time.time() - created_at < self.VNAPPMOB_KEY_TTL:
+                return key
+
         cache_dir = "data"
         os.makedirs(cache_dir, exist_ok=True)
         key_file = os.path.join(cache_dir, "vnappmob_key.json")
@@ -423,11 +557,11 @@ class FmarketClient:
             try:
                 with open(key_file) as f:
                     data = json.load(f)
-                    # Check expiry (15 days = 15 * 24 * 3600 seconds)
-                    # Let's refresh if older than 14 days to be safe
                     created_at = data.get("created_at", 0)
-                    if time.time() - created_at < 14 * 24 * 3600:
-                        return data.get("key", "")
+                    if time.time() - created_at < self.VNAPPMOB_KEY_TTL:
+                        key = data.get("key", "")
+                        self._cached_key = (key, created_at)
+                        return key
             except Exception:
                 pass  # Load failed
 
@@ -448,39 +582,38 @@ class FmarketClient:
                 new_key = raw_text.encode("ascii", "ignore").decode("ascii")
 
             # Save to cache
-            with open(key_file, "w") as f:
-                json.dump({"key": new_key, "created_at": time.time()}, f)
+            created_at = time.time()
+            _write_json_atomic(key_file, {"key": new_key, "created_at": created_at})
+            self._cached_key = (new_key, created_at)
 
             return new_key
 
         except Exception as e:
-            logger.error(f"Failed to fetch VNAppMob API key: {e}")
+            logger.error("Failed to fetch VNAppMob API key: %s", e)
             return ""
 
     def get_bank_rates(self) -> list[dict[str, Any]]:
         """
-        Fetch bank interest rates.
+        Fetch bank interest rates (non-empty results reused for BANK_RATES_TTL seconds).
         """
+        cached = _MARKET_CACHE.get("bank_rates")
+        if cached is not None:
+            return list(cached)
+
         url = f"{self.BASE_URL}/bank-interest-rate"
+        data = None
         try:
             response = self.client.get(url)
             response.raise_for_status()
-            data = response.json()
+            data = fast_json.loads(response.content)
 
             rates = []
             # data['data'] contains 'bankList'
             if "data" in data and isinstance(data["data"], dict):
                 bank_list = data["data"].get("bankList", [])
 
-                # Sort by value (rate) descending
-                # Value is string, need to convert to float
-                sorted_banks = sorted(
-                    bank_list,
-                    key=lambda x: float(x.get("value", 0) if x.get("value") else 0),
-                    reverse=True,
-                )
-
-                for bank in sorted_banks[:5]:
+                # Top 5 by rate, descending; each rate is parsed once
+                for bank in heapq.nlargest(5, bank_list, key=_rate_value):
                     rates.append(
                         {
                             "bank": bank.get("name"),
@@ -489,10 +622,13 @@ class FmarketClient:
                             ),  # It seems to be the single displayed rate
                         }
                     )
-            return rates
+            if rates:
+                _MARKET_CACHE.set("bank_rates", rates, ttl=self.BANK_RATES_TTL)
+            return list(rates)
         except Exception as e:
-            logger.error(f"Error fetching bank rates: {e}")
-            logger.error(f"Response was: {data}")
+            logger.error("Error fetching bank rates: %s", e)
+            if data is not None:
+                logger.error("Response was: %s", data)
             return []
 
     def get_market_news(self) -> list[dict[str, Any]]:
@@ -509,7 +645,7 @@ class FmarketClient:
         try:
             response = self.client.post(url, json=payload)
             response.raise_for_status()
-            data = response.json()
+            data = fast_json.loads(response.content)
 
             news = []
             rows = []
@@ -528,13 +664,14 @@ class FmarketClient:
                         "link": "https://fmarket.vn/blog/" + item.get("slug", ""),
                         "summary": item.get("shortDescription", ""),
                         "source": "Fmarket",
+                        # Aware UTC, like the RSS items it is merged with
                         "published_at": datetime.datetime.fromtimestamp(
-                            item.get("createAt", 0) / 1000
+                            (item.get("createAt") or 0) // 1000, tz=datetime.UTC
                         ),
                         "id": str(item.get("id")),
                     }
                 )
             return news
         except Exception as e:
-            logger.error(f"Error fetching Fmarket news: {e}")
+            logger.error("Error fetching Fmarket news: %s", e)
             return []
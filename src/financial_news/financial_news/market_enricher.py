@@ -5,14 +5,92 @@ Returns raw web search results for VN30, stocks, and funds.
 
 import asyncio
 import logging
-from typing import Any
+from collections.abc import Coroutine, Iterable
+from itertools import chain
+from typing import Any, TypeVar
 
+from bot_common.loop_runner import LoopRunner
 from bot_common.tavily_client import TavilyClient
+from bot_common.ttl_cache import TTLCache
 
 from .marketstack_client import MarketstackClient
+from .models import SearchResult
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Search results keyed by (query, max_results), shared across enricher instances
+_SEARCH_CACHE = TTLCache(maxsize=256, ttl=300)
+
+# Search query templates; the VN30 query only varies by direction, so both are built once
+_VN30_QUERY_TMPL = "VN30 index Vietnam stock market {direction} today news analysis"
+_VN30_QUERIES = {
+    up: _VN30_QUERY_TMPL.format(direction="tăng" if up else "giảm") for up in (True, False)
+}
+_STOCKS_QUERY_TMPL = "Vietnam stock {symbols} news analysis today"
+_FUNDS_QUERY_TMPL = "Vietnam stock fund investment {holdings} performance outlook"
+
+
+def _format_result(result: SearchResult) -> str:
+    """Format one search result as a markdown list line."""
+    line = f"- [{result.title}]({result.url})"
+    if result.snippet:
+        line += f": {result.snippet}"
+    if result.date:
+        line += f" ({result.date})"
+    return line
+
+
+def _first_unique(values: Iterable[str], limit: int) -> list[str]:
+    """First `limit` distinct values in order; stops consuming the iterable once full."""
+    unique: dict[str, None] = {}
+    for value in values:
+        if value not in unique:
+            unique[value] = None
+            if len(unique) == limit:
+                break
+    return list(unique)
+
+
+def _mover_symbols(top_movers: dict[str, list], limit: int = 3) -> tuple[list[str], list[str]]:
+    """Symbols of the first `limit` gainers and losers."""
+    gainers = [g["symbol"] for g in top_movers.get("gainers", [])[:limit] if g.get("symbol")]
+    losers = [lo["symbol"] for lo in top_movers.get("losers", [])[:limit] if lo.get("symbol")]
+    return gainers, losers
+
+
+def _holding_symbols(funds: list[dict[str, Any]], per_fund: int) -> list[str]:
+    """Stock codes of each fund's first `per_fund` holdings, in order (may repeat)."""
+    return [
+        h["stock_code"]
+        for fund in funds
+        for h in fund.get("top_holdings", [])[:per_fund]
+        if h.get("stock_code")
+    ]
+
+
+def _empty_enrichments() -> dict[str, str]:
+    return {
+        "vn30_context": "",
+        "stocks_context": "",
+        "funds_context": "",
+        "market_data": "",
+    }
+
+
+def _search_preconditions(market_stats: dict[str, Any]) -> tuple[bool, bool, bool]:
+    """
+    Whether there is index movement, movers and fund data to search about.
+
+    A flat index or empty mover lists (holidays, failed fetches) yield no query.
+    """
+    top_movers = market_stats.get("top_movers") or {}
+    has_movement = bool((market_stats.get("vn30_current") or {}).get("change_percent"))
+    has_movers = bool(top_movers.get("gainers") or top_movers.get("losers"))
+    has_funds = bool(market_stats.get("top_funds") or market_stats.get("watchlist_funds"))
+    return has_movement, has_movers, has_funds
+
 
 class MarketEnricher:
     """
@@ -22,8 +100,16 @@ class MarketEnricher:
     def __init__(self):
         self.tavily = TavilyClient()
         self.marketstack = MarketstackClient()
-
-    def _search(self, query: str, max_results: int = 5, timeout: int = 30) -> list[dict[str, str]]:
+        # Event loop reused by the sync wrappers, so their HTTP clients stay warm
+        self._runner = LoopRunner("MarketEnricher")
+
+    async def _search_async(
+        self,
+        query: str,
+        max_results: int = 5,
+        timeout: int = 30,
+        seen_queries: set[str] | None = None,
+    ) -> list[SearchResult]:
         """
         Search using Tavily Search API.
 
@@ -31,44 +117,42 @@ class MarketEnricher:
             query: Search query
             max_results: Maximum number of results to return
             timeout: Request timeout in seconds
+            seen_queries: Normalized queries already issued in this batch;
+                a repeat returns no results instead of a second search
 
         Returns:
-            List of search results with title, url, snippet, date
+            List of search results (shared with the cache; frozen)
         """
+        if seen_queries is not None:
+            normalized = " ".join(query.lower().split())
+            if normalized in seen_queries:
+                logger.debug("Skipping duplicate search: %s", query)
+                return []
+            seen_queries.add(normalized)
+
+        cache_key = (query, max_results)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            results = asyncio.run(self.tavily.search(query=query, max_results=max_results))
-
-            return [
-                {
-                    "title": item.get("title", ""),
-                    "url": item.get("url", ""),
-                    "snippet": item.get("content", "")[:300],
-                    "date": "",  # Tavily might not return date easily in basic search
-                }
-                for item in results.get("results", [])
-            ]
+            results = await self.tavily.search(query=query, max_results=max_results)
+
+            parsed = [SearchResult.from_tavily(item) for item in results.get("results", [])]
+            _SEARCH_CACHE.set(cache_key, parsed)
+            return parsed
 
         except Exception as e:
-            logger.error(f"Search failed: {e}")
+            logger.error("Search failed: %s", e)
             return []
 
-    def _format_results(self, results: list[dict[str, str]]) -> str:
+    def _format_results(self, results: list[SearchResult]) -> str:
         """Format search results into a readable string."""
-        if not results:
-            return ""
+        return "\n".join(_format_result(r) for r in results)
 
-        formatted = []
-        for r in results:
-            line = f"- [{r.get('title', 'N/A')}]({r.get('url', '')})"
-            if r.get("snippet"):
-                line += f": {r['snippet'][:150]}"
-            if r.get("date"):
-                line += f" ({r['date']})"
-            formatted.append(line)
-
-        return "\n".join(formatted)
-
-    def search_vn30_context(self, vn30_data: dict[str, Any]) -> str:
+    async def search_vn30_context_async(
+        self, vn30_data: dict[str, Any], seen_queries: set[str] | None = None
+    ) -> str:
         """
         Search for VN30 index news and analysis.
 
@@ -78,72 +162,95 @@ class MarketEnricher:
         if not self.tavily.api_key or not vn30_data:
             return ""
 
-        change = vn30_data.get("change_percent", 0)
-        direction = "tăng" if change >= 0 else "giảm"
-
-        query = f"VN30 index Vietnam stock market {direction} today news analysis"
+        query = _VN30_QUERIES[vn30_data.get("change_percent", 0) >= 0]
 
         logger.info("Searching VN30 context via Tavily...")
-        results = self._search(query, max_results=3)
+        results = await self._search_async(query, max_results=3, seen_queries=seen_queries)
         return self._format_results(results)
 
-    def search_top_stocks_context(self, top_movers: dict[str, list]) -> str:
+    def search_vn30_context(self, vn30_data: dict[str, Any]) -> str:
+        """Synchronous wrapper for VN30 context search."""
+        return self._run(self.search_vn30_context_async(vn30_data))
+
+    async def search_top_stocks_context_async(
+        self,
+        top_movers: dict[str, list],
+        seen_queries: set[str] | None = None,
+        symbols: Iterable[str] | None = None,
+    ) -> str:
         """
         Search for news about top gaining/losing stocks.
 
+        Args:
+            top_movers: Dictionary with gainers and losers lists
+            seen_queries: Shared duplicate-query set (see _search_async)
+            symbols: Mover symbols already extracted by the caller;
+                derived from top_movers when omitted
+
         Returns:
             Formatted search results string.
         """
         if not self.tavily.api_key or not top_movers:
             return ""
 
-        gainers = top_movers.get("gainers", [])[:3]
-        losers = top_movers.get("losers", [])[:3]
-
-        symbols = [g["symbol"] for g in gainers if g.get("symbol")]
-        symbols += [loser["symbol"] for loser in losers if loser.get("symbol")]
+        if symbols is None:
+            movers = chain(top_movers.get("gainers", [])[:3], top_movers.get("losers", [])[:3])
+            symbols = (m["symbol"] for m in movers if m.get("symbol"))
 
-        if not symbols:
+        query_symbols = _first_unique(symbols, 4)
+        if not query_symbols:
             return ""
 
-        query = f"Vietnam stock {' '.join(symbols[:4])} news analysis today"
+        query = _STOCKS_QUERY_TMPL.format(symbols=" ".join(query_symbols))
 
         logger.info("Searching top stocks context via Tavily...")
-        results = self._search(query, max_results=3)
+        results = await self._search_async(query, max_results=3, seen_queries=seen_queries)
         return self._format_results(results)
 
-    def search_fund_context(self, market_stats: dict[str, Any]) -> str:
+    def search_top_stocks_context(self, top_movers: dict[str, list]) -> str:
+        """Synchronous wrapper for top stocks context search."""
+        return self._run(self.search_top_stocks_context_async(top_movers))
+
+    async def search_fund_context_async(
+        self,
+        market_stats: dict[str, Any],
+        seen_queries: set[str] | None = None,
+        holdings: list[str] | None = None,
+    ) -> str:
         """
         Search for fund performance and market sector news.
 
+        Args:
+            market_stats: Dictionary containing top_funds and watchlist_funds
+            seen_queries: Shared duplicate-query set (see _search_async)
+            holdings: Holding codes already extracted by the caller;
+                derived from market_stats when omitted
+
         Returns:
             Formatted search results string.
         """
-        top_funds = market_stats.get("top_funds", [])
-        # Extract top holdings for search from both top_funds and watchlist_funds
-        all_funds = (market_stats.get("watchlist_funds") or []) + top_funds
+        if holdings is None:
+            # Top 2 holdings of the first 5 funds, watchlist first
+            all_funds = (market_stats.get("watchlist_funds") or []) + (
+                market_stats.get("top_funds") or []
+            )
+            holdings = _holding_symbols(all_funds[:5], per_fund=2)
 
-        all_holdings = []
-        for fund in all_funds[:5]:  # Check first 5 funds
-            holdings = fund.get("top_holdings", [])
-            for h in holdings[:2]:
-                if h.get("stock_code"):
-                    all_holdings.append(h["stock_code"])
-
-        unique_holdings = list(set(all_holdings))[:4]
+        unique_holdings = _first_unique(holdings, 4)
 
         if not unique_holdings:
             return ""
 
-        if not unique_holdings:
-            return ""
-
-        query = f"Vietnam stock fund investment {' '.join(unique_holdings)} performance outlook"
+        query = _FUNDS_QUERY_TMPL.format(holdings=" ".join(unique_holdings))
 
         logger.info("Searching fund context via Tavily...")
-        results = self._search(query, max_results=3)
+        results = await self._search_async(query, max_results=3, seen_queries=seen_queries)
         return self._format_results(results)
 
+    def search_fund_context(self, market_stats: dict[str, Any]) -> str:
+        """Synchronous wrapper for fund context search."""
+        return self._run(self.search_fund_context_async(market_stats))
+
     async def search_market_data_async(self, symbols: list[str]) -> str:
         """
         Fetch market data (intraday/EOD) for symbols using Marketstack asynchronously.
@@ -151,30 +258,22 @@ class MarketEnricher:
         if not self.marketstack.api_key or not symbols:
             return ""
 
-        data_summary = []
+        # One batched intraday request, then one EOD request for whatever is missing
+        intraday = await self.marketstack.get_intraday_multi(symbols)
+        missing = [s for s in symbols if s not in intraday]
+        eod = await self.marketstack.get_eod_multi(missing) if missing else {}
 
-        async def fetch_symbol(symbol: str):
-            # Intraday
-            intraday = await asyncio.to_thread(self.marketstack.get_intraday, symbol)
-            if intraday and "data" in intraday and intraday["data"]:
-                latest = intraday["data"][0]
+        data_summary = []
+        for symbol in symbols:
+            if symbol in intraday:
+                latest = intraday[symbol][0]
                 price = latest.get("last") or latest.get("close")
-                return f"- **{symbol}**: {price} (Intraday)"
-            else:
-                # EOD fallback
-                eod = await asyncio.to_thread(self.marketstack.get_eod, symbol)
-                if eod and "data" in eod and eod["data"]:
-                    latest = eod["data"][0]
-                    price = latest.get("close")
-                    date = latest.get("date", "")[:10]
-                    return f"- **{symbol}**: {price} (Close {date})"
-            return None
-
-        # Fetch all concurrently
-        tasks = [fetch_symbol(s) for s in symbols]
-        results = await asyncio.gather(*tasks)
-
-        data_summary = [r for r in results if r]
+                data_summary.append(f"- **{symbol}**: {price} (Intraday)")
+            elif symbol in eod:
+                latest = eod[symbol][0]
+                price = latest.get("close")
+                date = latest.get("date", "")[:10]
+                data_summary.append(f"- **{symbol}**: {price} (Close {date})")
 
         if not data_summary:
             return ""
@@ -183,12 +282,15 @@ class MarketEnricher:
 
     def search_market_data(self, symbols: list[str]) -> str:
         """Synchronous wrapper for market data search."""
-        return asyncio.run(self.search_market_data_async(symbols))
+        return self._run(self.search_market_data_async(symbols))
 
-    def enrich_market_stats(self, market_stats: dict[str, Any]) -> dict[str, str]:
+    async def enrich_market_stats_async(self, market_stats: dict[str, Any]) -> dict[str, str]:
         """
         Enrich all market data with Perplexity search results.
 
+        The web searches and the Marketstack lookup are independent, so they
+        run concurrently; a failure in one leaves its key empty.
+
         Args:
             market_stats: Dictionary containing vn30_current, top_movers, top_funds, etc.
 
@@ -198,50 +300,78 @@ class MarketEnricher:
             - stocks_context: Search results about top movers
             - funds_context: Search results about funds/holdings
         """
-        enrichments = {
-            "vn30_context": "",
-            "stocks_context": "",
-            "funds_context": "",
-            "market_data": "",
-        }
+        enrichments = _empty_enrichments()
 
         if not self.tavily.api_key:
             logger.warning("Skipping market enrichment - no API key")
             return enrichments
 
+        # Only search for what the data can actually say something about
+        has_movement, has_movers, has_funds = _search_preconditions(market_stats)
+        if not (has_movement or has_movers or has_funds):
+            logger.info("Skipping market enrichment - no market movement or fund data")
+            return enrichments
+
+        vn30_current = market_stats.get("vn30_current") or {}
+        top_movers = market_stats.get("top_movers") or {}
+        top_funds = market_stats.get("top_funds") or []
+        watchlist_funds = market_stats.get("watchlist_funds") or []
+
+        # Extract symbols once; the searches and the Marketstack lookup share them
+        gainer_syms, loser_syms = _mover_symbols(top_movers)
+        fund_syms = _holding_symbols((watchlist_funds + top_funds)[:5], per_fund=2)
+        watchlist_syms = _holding_symbols(watchlist_funds, per_fund=1)  # Top 1 holding
+
+        tasks: dict[str, Coroutine[Any, Any, str]] = {}
+        # Shared by the searches below so an identical query is only sent once
+        seen_queries: set[str] = set()
+
         # Search VN30 context
-        vn30_current = market_stats.get("vn30_current", {})
-        if vn30_current:
-            enrichments["vn30_context"] = self.search_vn30_context(vn30_current)
+        if has_movement:
+            tasks["vn30_context"] = self.search_vn30_context_async(vn30_current, seen_queries)
 
         # Search top stocks context
-        top_movers = market_stats.get("top_movers", {})
-        if top_movers:
-            enrichments["stocks_context"] = self.search_top_stocks_context(top_movers)
+        if has_movers:
+            tasks["stocks_context"] = self.search_top_stocks_context_async(
+                top_movers, seen_queries, symbols=chain(gainer_syms, loser_syms)
+            )
 
         # Search fund context
-        top_funds = market_stats.get("top_funds", [])
-        watchlist_funds = market_stats.get("watchlist_funds", [])
-
-        if top_funds or watchlist_funds:
-            enrichments["funds_context"] = self.search_fund_context(market_stats)
-
-        # Enrich with Market Data (Marketstack)
-        # Collect relevant symbols from top movers and funds
-        symbols_to_check = []
-        if top_movers:
-            gainers = top_movers.get("gainers", [])[:2]
-            symbols_to_check.extend([g["symbol"] for g in gainers if g.get("symbol")])
-
-        if watchlist_funds:
-            for f in watchlist_funds:
-                holdings = f.get("top_holdings", [])
-                for h in holdings[:1]:  # Top 1 holding
-                    if h.get("stock_code"):
-                        symbols_to_check.append(h["stock_code"])
-
+        if has_funds:
+            tasks["funds_context"] = self.search_fund_context_async(
+                market_stats, seen_queries, holdings=fund_syms
+            )
+
+        # Enrich with Market Data (Marketstack): top 2 gainers plus watchlist
+        # top holdings, deduplicated in order
+        symbols_to_check = list(dict.fromkeys(gainer_syms[:2] + watchlist_syms))
         if symbols_to_check:
-            # Basic dedup
-            enrichments["market_data"] = self.search_market_data(list(set(symbols_to_check)))
+            tasks["market_data"] = self.search_market_data_async(symbols_to_check)
+
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for key, result in zip(tasks, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error("Market enrichment for %s failed: %s", key, result)
+            else:
+                enrichments[key] = result
 
         return enrichments
+
+    def enrich_market_stats(self, market_stats: dict[str, Any]) -> dict[str, str]:
+        """Synchronous wrapper for market enrichment."""
+        # Guaranteed empty result: answer without creating the event loop at all
+        if not self.tavily.api_key or not any(_search_preconditions(market_stats)):
+            return _empty_enrichments()
+        return self._run(self.enrich_market_stats_async(market_stats))
+
+    async def aclose(self) -> None:
+        """Close loop-bound HTTP clients owned by this enricher."""
+        await self.marketstack.aclose()
+
+    def close(self) -> None:
+        """Close the HTTP clients and the event loop used by the sync wrappers."""
+        self._runner.close(self.aclose)
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine for a sync wrapper on this enricher's persistent loop."""
+        return self._runner.run(coro)
@@ -1,11 +1,20 @@
+import asyncio
 import logging
 import os
 from typing import Any
 
 import httpx
+from bot_common import fast_json
+from bot_common.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Responses shared by every client in the process; intraday data goes stale
+# within a minute, EOD data only changes once a day.
+_RESPONSE_CACHE = TTLCache(maxsize=256)
+INTRADAY_TTL = 60
+EOD_TTL = 3600
+
 
 class MarketstackClient:
     """
@@ -14,18 +23,57 @@ class MarketstackClient:
 
     BASE_URL = "https://api.marketstack.com/v2"
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, client: httpx.AsyncClient | None = None):
         self.api_key = api_key or os.getenv("MARKETSTACK_API_KEY")
         if not self.api_key:
             logger.warning(
                 "MARKETSTACK_API_KEY not set. Marketstack functionality will be disabled."
             )
 
-        self.client = httpx.Client(timeout=30.0)
+        # Created lazily unless injected: an AsyncClient is bound to the event
+        # loop it first runs on. An injected client is owned by the caller.
+        self._aclient: httpx.AsyncClient | None = client
+        self._owns_client = client is None
+        # Loop the owned client was created on; close() finishes it there
+        self._aclient_loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: dict[tuple[str, str, int], asyncio.Task[dict[str, Any]]] = {}
+
+    def _get_aclient(self) -> httpx.AsyncClient:
+        """Return the keep-alive client, creating it on first use."""
+        if self._owns_client and (self._aclient is None or self._aclient.is_closed):
+            self._aclient = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+            self._aclient_loop = asyncio.get_running_loop()
+        return self._aclient
+
+    async def aclose(self) -> None:
+        """Close the HTTP client (call before the owning event loop shuts down)."""
+        if self._owns_client and self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._aclient_loop = None
 
-    def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+    def close(self) -> None:
+        """
+        Sync counterpart of aclose(), for owners that drive the client from their
+        own event loop: runs aclose() on that loop. Async callers await aclose().
+        """
+        if not self._owns_client or self._aclient is None:
+            return
+
+        loop = self._aclient_loop
+        if loop is None or loop.is_closed():
+            # Its connections died with the loop; just let the next call start fresh
+            self._aclient = None
+            self._aclient_loop = None
+            return
+        if loop.is_running():
+            raise RuntimeError(
+                "MarketstackClient.close() called inside its event loop; await aclose()"
+            )
+        loop.run_until_complete(self.aclose())
 
     def _get_params(self, params: dict[str, Any]) -> dict[str, Any]:
         """Add API key to params."""
@@ -34,39 +82,92 @@ class MarketstackClient:
             p["access_key"] = self.api_key
         return p
 
-    def get_intraday(self, symbol: str, limit: int = 1) -> dict[str, Any]:
+    async def get_intraday(self, symbol: str, limit: int = 1) -> dict[str, Any]:
         """
         Get intraday data for a symbol.
         Note: Free plan might not support intraday for all exchanges.
         """
-        if not self.api_key:
-            return {}
+        return await self._get_shared("intraday", symbol, limit, INTRADAY_TTL)
 
-        url = f"{self.BASE_URL}/intraday"
-        params = {"symbols": symbol, "limit": limit}
+    async def get_eod(self, symbol: str, limit: int = 1) -> dict[str, Any]:
+        """
+        Get End-of-Day data for a symbol.
+        """
+        return await self._get_shared("eod", symbol, limit, EOD_TTL)
 
-        try:
-            response = self.client.get(url, params=self._get_params(params))
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error fetching Marketstack intraday for {symbol}: {e}")
+    async def get_intraday_multi(
+        self, symbols: list[str], limit: int = 1
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get intraday data for several symbols in one request.
+
+        Returns:
+            Up to `limit` latest rows per symbol, keyed by symbol. Symbols with
+            no data are absent.
+        """
+        return await self._get_multi("intraday", symbols, limit, INTRADAY_TTL)
+
+    async def get_eod_multi(
+        self, symbols: list[str], limit: int = 1
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Get End-of-Day data for several symbols in one request.
+
+        Returns:
+            Up to `limit` latest rows per symbol, keyed by symbol.
+        """
+        return await self._get_multi("eod", symbols, limit, EOD_TTL)
+
+    async def _get_multi(
+        self, endpoint: str, symbols: list[str], limit: int, ttl: int
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Fetch a comma-separated symbol batch and split the rows by symbol."""
+        if not symbols:
             return {}
 
-    def get_eod(self, symbol: str, limit: int = 1) -> dict[str, Any]:
+        # Marketstack's limit counts rows across all symbols, not per symbol
+        data = await self._get_shared(endpoint, ",".join(symbols), limit * len(symbols), ttl)
+
+        grouped: dict[str, list[dict[str, Any]]] = {}
+        for row in data.get("data") or []:
+            rows = grouped.setdefault(row.get("symbol", ""), [])
+            if len(rows) < limit:
+                rows.append(row)
+        return grouped
+
+    async def _get_shared(self, endpoint: str, symbol: str, limit: int, ttl: int) -> dict[str, Any]:
         """
-        Get End-of-Day data for a symbol.
+        Serve from cache, or join an identical in-flight request, or start one.
+        Concurrent callers for the same (endpoint, symbol, limit) share one HTTP call.
         """
         if not self.api_key:
             return {}
 
-        url = f"{self.BASE_URL}/eod"
+        cache_key = (endpoint, symbol, limit)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(endpoint, symbol, limit, ttl))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        # Shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, endpoint: str, symbol: str, limit: int, ttl: int) -> dict[str, Any]:
+        """Fetch an endpoint for one symbol and cache a successful response."""
+        url = f"{self.BASE_URL}/{endpoint}"
         params = {"symbols": symbol, "limit": limit}
 
         try:
-            response = self.client.get(url, params=self._get_params(params))
+            response = await self._get_aclient().get(url, params=self._get_params(params))
             response.raise_for_status()
-            return response.json()
+            data = fast_json.loads(response.content)
+            _RESPONSE_CACHE.set((endpoint, symbol, limit), data, ttl=ttl)
+            return data
         except Exception as e:
-            logger.error(f"Error fetching Marketstack EOD for {symbol}: {e}")
+            logger.error("Error fetching Marketstack %s for %s: %s", endpoint, symbol, e)
             return {}
@@ -3,6 +3,7 @@ import os
 from typing import Any
 
 import httpx
+from bot_common import fast_json
 
 logger = logging.getLogger(__name__)
 
@@ -14,16 +15,19 @@ class MediastackClient:
 
     BASE_URL = "https://api.mediastack.com/v2"
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, client: httpx.Client | None = None):
         self.api_key = api_key or os.getenv("MEDIASTACK_API_KEY")
         if not self.api_key:
             logger.warning("MEDIASTACK_API_KEY not set. Mediastack functionality will be disabled.")
 
-        self.client = httpx.Client(timeout=30.0)
+        # An injected client is shared with the caller, who is responsible for closing it
+        self.client = client or httpx.Client(timeout=30.0)
+        self._owns_client = client is None
 
     def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+        """Close the HTTP client if this instance created it."""
+        if self._owns_client:
+            self.client.close()
 
     def _get_params(self, params: dict[str, Any]) -> dict[str, Any]:
         """Add API key to params."""
@@ -62,7 +66,7 @@ class MediastackClient:
         try:
             response = self.client.get(url, params=self._get_params(params))
             response.raise_for_status()
-            return response.json()
+            return fast_json.loads(response.content)
         except Exception as e:
-            logger.error(f"Error fetching Mediastack news: {e}")
+            logger.error("Error fetching Mediastack news: %s", e)
             return {}
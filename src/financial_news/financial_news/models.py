@@ -0,0 +1,29 @@
+"""Typed records passed between financial news pipeline stages."""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    """One web search hit used as market context."""
+
+    title: str
+    url: str
+    snippet: str = ""
+    date: str = ""
+
+    @classmethod
+    def from_tavily(cls, item: dict[str, Any]) -> "SearchResult":
+        """Build from a Tavily result; only the first 150 chars of content are ever shown."""
+        get = item.get
+        return cls(
+            title=get("title", ""),
+            url=get("url", ""),
+            snippet=(get("content") or "")[:150],
+            date="",  # Tavily might not return date easily in basic search
+        )
+
+    def to_dict(self) -> dict[str, str]:
+        """Plain dict for JSON caches (asdict would deep-copy each field)."""
+        return {"title": self.title, "url": self.url, "snippet": self.snippet, "date": self.date}
@@ -1,16 +1,41 @@
 import asyncio
 import logging
-from typing import Any
-
+import os
+from collections.abc import Callable, Coroutine, Iterable, Sequence
+from functools import partial
+from itertools import islice
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
+
+from bot_common.loop_runner import LoopRunner
 from bot_common.tavily_client import TavilyClient
+from bot_common.ttl_cache import TTLCache
 
 from .marketstack_client import MarketstackClient
 from .mediastack_client import MediastackClient
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Search responses shared by every enricher in the process; the topic lists are
+# mostly static, so repeated calls within the TTL skip Tavily entirely
+_SEARCH_CACHE = TTLCache(maxsize=512, ttl=int(os.getenv("NEWS_CACHE_TTL", "900")))
+
+
+def _query_key(query: str) -> str:
+    """
+    Cache key that ignores case, spacing and word order.
+
+    Topic strings are often reworded permutations of each other ("interest rate
+    monetary policy" / "monetary policy interest rate"); keyword search ranks
+    them the same, so they share one cached response.
+    """
+    return " ".join(sorted(set(query.lower().split())))
+
+
 # Political/Policy news search topics for Vietnam financial markets
-POLITICAL_NEWS_TOPICS = [
+POLITICAL_NEWS_TOPICS = (
     # Vietnam Government & Economy
     "Vietnam government economic policy stock market 2025",
     "Vietnam monetary policy interest rate State Bank",
@@ -34,10 +59,10 @@ POLITICAL_NEWS_TOPICS = [
     "Vietnam trade policy US China impact stock",
     "Vietnam FDI foreign direct investment policy",
     "ASEAN Vietnam trade agreement market impact",
-]
+)
 
 # Financial news domains to prioritize
-FINANCIAL_DOMAINS = [
+FINANCIAL_DOMAINS = (
     "cafef.vn",
     "vietstock.vn",
     "vnexpress.net",
@@ -46,7 +71,24 @@ FINANCIAL_DOMAINS = [
     "investing.com",
     "finance.yahoo.com",
     "marketwatch.com",
-]
+)
+
+# Political news content is only ever shown as a short summary, so it is
+# truncated once when collected rather than on every format
+POLITICAL_CONTENT_CHARS = 200
+
+
+def _format_political_item(index: int, item: dict[str, Any]) -> str:
+    """Format one political news item as a numbered block ending in a blank line."""
+    title = item.get("title", "No title")
+    source = item.get("source", "Unknown")
+    # Already capped at POLITICAL_CONTENT_CHARS when collected
+    content = item.get("content", "")
+
+    block = f"**{index}. {title}**\n   Source: {source}\n"
+    if content:
+        block += f"   Summary: {content}...\n"
+    return block
 
 
 class NewsEnricher:
@@ -65,15 +107,19 @@ class NewsEnricher:
         self.tavily = TavilyClient()
         self.mediastack = MediastackClient()
         self.marketstack = MarketstackClient()
-        self.search_topics = POLITICAL_NEWS_TOPICS.copy()
+        # Event loop reused by the sync wrappers, so their HTTP clients stay warm
+        self._runner = LoopRunner("NewsEnricher")
+        # Immutable, so the default topics are shared rather than copied
+        self.search_topics: tuple[str, ...] = POLITICAL_NEWS_TOPICS
         if custom_topics:
-            self.search_topics.extend(custom_topics)
+            self.search_topics += tuple(custom_topics)
 
     async def search_async(
         self,
         query: str,
         max_results: int = 3,
-        include_domains: list[str] | None = None,
+        include_domains: Sequence[str] | None = None,
+        use_cache: bool = True,
     ) -> str:
         """
         Search for a query and return a summarized context string.
@@ -82,21 +128,33 @@ class NewsEnricher:
             query: The search query.
             max_results: Maximum number of results to return.
             include_domains: Optional list of domains to prioritize.
+            use_cache: Reuse a result from the last NEWS_CACHE_TTL seconds.
         """
         if not self.tavily.api_key:
             return ""
 
-        return await self.tavily.get_search_context(
+        search_depth = "advanced" if include_domains else "basic"
+        cache_key = ("context", _query_key(query), max_results, search_depth)
+        if use_cache:
+            cached = _SEARCH_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
+        context = await self.tavily.get_search_context(
             query,
             max_results=max_results,
-            search_depth="advanced" if include_domains else "basic",
+            search_depth=search_depth,
         )
+        if context:  # "" also means the search failed
+            _SEARCH_CACHE.set(cache_key, context)
+        return context
 
     async def search_raw_async(
         self,
         query: str,
         max_results: int = 5,
-        include_domains: list[str] | None = None,
+        include_domains: Sequence[str] | None = None,
+        use_cache: bool = True,
     ) -> list[dict[str, Any]]:
         """
         Search and return raw results with full metadata.
@@ -105,13 +163,20 @@ class NewsEnricher:
             query: The search query.
             max_results: Maximum number of results.
             include_domains: Optional domains to include.
+            use_cache: Reuse results from the last NEWS_CACHE_TTL seconds.
 
         Returns:
-            List of search result dictionaries.
+            List of search result dictionaries (shared with the cache).
         """
         if not self.tavily.api_key:
             return []
 
+        cache_key = ("raw", _query_key(query), max_results, tuple(include_domains or ()))
+        if use_cache:
+            cached = _SEARCH_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             data = await self.tavily.search(
                 query=query,
@@ -119,20 +184,23 @@ class NewsEnricher:
                 include_domains=include_domains,
                 search_depth="advanced",
             )
-            return data.get("results", [])
+            results = data.get("results", [])
+            _SEARCH_CACHE.set(cache_key, results)
+            return results
         except Exception as e:
-            logger.error(f"Search failed for '{query[:30]}...': {e}")
+            logger.error("Search failed for '%s...': %s", query[:30], e)
             return []
 
     def search(self, query: str, max_results: int = 3) -> str:
         """Synchronous wrapper for search."""
-        return asyncio.run(self.search_async(query, max_results=max_results))
+        return self._run(self.search_async(query, max_results=max_results))
 
     async def search_political_news_async(
         self,
-        topics: list[str] | None = None,
+        topics: Sequence[str] | None = None,
         max_results_per_topic: int = 3,
         max_topics: int = 5,
+        max_items: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for political/policy news affecting stocks and funds.
@@ -141,6 +209,8 @@ class NewsEnricher:
             topics: Optional custom topics. Uses default POLITICAL_NEWS_TOPICS if None.
             max_results_per_topic: Max results per search topic.
             max_topics: Maximum number of topics to search (to limit API calls).
+            max_items: Stop once this many unique items are collected, cancelling
+                the searches still in flight.
 
         Returns:
             List of unique news items with title, url, content, and source.
@@ -151,41 +221,74 @@ class NewsEnricher:
 
         search_topics = topics or self.search_topics[:max_topics]
         all_results: list[dict[str, Any]] = []
+        append = all_results.append
+        # Deduplicates within this run only: prior runs' URLs are still wanted,
+        # since this is the summarizer's policy context for the current hour
         seen_urls: set[str] = set()
 
-        logger.info(f"Searching {len(search_topics)} political news topics...")
+        logger.info("Searching %d political news topics...", len(search_topics))
 
-        for topic in search_topics:
-            logger.debug(f"Searching: {topic[:50]}...")
-            results = await self.search_raw_async(
-                query=topic,
-                max_results=max_results_per_topic,
-                include_domains=FINANCIAL_DOMAINS,
-            )
+        # Topics are independent searches: start them all, then merge the results
+        # in topic order (a slow topic holds back the merges after it). Topic order
+        # keeps deduplication identical to a sequential pass.
+        search_topic = partial(
+            self.search_raw_async,
+            max_results=max_results_per_topic,
+            include_domains=FINANCIAL_DOMAINS,
+        )
+        tasks = [asyncio.ensure_future(search_topic(topic)) for topic in search_topics]
 
-            for result in results:
-                url = result.get("url", "")
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    all_results.append(
-                        {
-                            "title": result.get("title", ""),
-                            "url": url,
-                            "content": result.get("content", ""),
-                            "source": result.get("url", "").split("/")[2]
-                            if "/" in result.get("url", "")
-                            else "",
-                            "topic": topic,
-                            "published_date": result.get("published_date", ""),
-                        }
-                    )
-
-        logger.info(f"Found {len(all_results)} unique political news items.")
+        try:
+            for topic, task in zip(search_topics, tasks, strict=True):
+                try:
+                    results = await task
+                except Exception as e:
+                    logger.error("Political news search for '%s...' failed: %s", topic[:30], e)
+                    continue
+
+                self._merge_political_results(topic, results, seen_urls, append)
+                if max_items is not None and len(all_results) >= max_items:
+                    del all_results[max_items:]
+                    break
+        finally:
+            # Early exit or cancellation: don't leave searches running, and wait
+            # for them to unwind so none outlives the client it was using
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info("Found %d unique political news items.", len(all_results))
         return all_results
 
+    @staticmethod
+    def _merge_political_results(
+        topic: str,
+        results: list[dict[str, Any]],
+        seen_urls: set[str],
+        append: Callable[[dict[str, Any]], None],
+    ) -> None:
+        """Append one topic's results whose URL has not been seen yet."""
+
+        for result in results:
+            get = result.get
+            url = get("url") or ""  # Tavily may send null
+            if not url or url in seen_urls:
+                continue
+            seen_urls.add(url)
+            append(
+                {
+                    "title": get("title", ""),
+                    "url": url,
+                    "content": (get("content") or "")[:POLITICAL_CONTENT_CHARS],
+                    "source": urlsplit(url).netloc,
+                    "topic": topic,
+                    "published_date": get("published_date", ""),
+                }
+            )
+
     def search_political_news(
         self,
-        topics: list[str] | None = None,
+        topics: Sequence[str] | None = None,
         max_results_per_topic: int = 3,
         max_topics: int = 5,
     ) -> list[dict[str, Any]]:
@@ -200,7 +303,7 @@ class NewsEnricher:
         Returns:
             List of political news items.
         """
-        return asyncio.run(
+        return self._run(
             self.search_political_news_async(
                 topics=topics,
                 max_results_per_topic=max_results_per_topic,
@@ -210,66 +313,70 @@ class NewsEnricher:
 
     def format_political_news_for_summary(
         self,
-        news_items: list[dict[str, Any]],
+        news_items: Iterable[dict[str, Any]],
         limit: int = 10,
     ) -> str:
         """
         Format political news items into a summary string for LLM context.
 
         Args:
-            news_items: List of political news items.
+            news_items: Political news items; only the first `limit` are read,
+                so a generator is consumed no further than that.
             limit: Maximum items to include.
 
         Returns:
             Formatted string for LLM consumption.
         """
-        if not news_items:
+        blocks = [
+            _format_political_item(i, item) for i, item in enumerate(islice(news_items, limit), 1)
+        ]
+        if not blocks:
             return ""
 
-        lines = ["## Political & Policy News Affecting Markets\n"]
-
-        for i, item in enumerate(news_items[:limit], 1):
-            title = item.get("title", "No title")
-            source = item.get("source", "Unknown")
-            content = item.get("content", "")[:200]  # Truncate content
-
-            lines.append(f"**{i}. {title}**")
-            lines.append(f"   Source: {source}")
-            if content:
-                lines.append(f"   Summary: {content}...")
-            lines.append("")
+        return "## Political & Policy News Affecting Markets\n\n" + "\n".join(blocks)
 
-        return "\n".join(lines)
-
-    def enrich_news_items(
+    async def enrich_news_items_async(
         self, news_items: list[dict[str, Any]], limit: int = 3
     ) -> list[dict[str, Any]]:
         """
         Enriches the top N news items with web search context.
         Modifies the items in-place (or returns list of enriched items).
+
+        The next `limit` titled items are searched concurrently; items whose
+        search comes back empty are replaced from further down the list, as
+        the sequential version did.
         """
         if not self.tavily.api_key:
             return news_items
 
-        count = 0
-        for item in news_items:
-            if count >= limit:
+        candidates = (item for item in news_items if item.get("title"))
+        remaining = limit
+        while remaining > 0:
+            batch = list(islice(candidates, remaining))
+            if not batch:
                 break
 
-            query = item.get("title", "")
-            if not query:
-                continue
-
-            logger.info(f"Enriching: {query[:30]}...")
-            context = self.search(query)
+            for item in batch:
+                logger.info("Enriching: %s...", item["title"][:30])
+            contexts = await asyncio.gather(*(self.search_async(item["title"]) for item in batch))
 
-            if context:
-                # Append context to summary
-                item["summary"] = item.get("summary", "") + "\n\n**Web Context:**\n" + context
-                count += 1
+            for item, context in zip(batch, contexts, strict=True):
+                if not context:
+                    continue
+                # Append context to summary in one allocation
+                item["summary"] = "".join(
+                    (item.get("summary") or "", "\n\n**Web Context:**\n", context)
+                )
+                remaining -= 1
 
         return news_items
 
+    def enrich_news_items(
+        self, news_items: list[dict[str, Any]], limit: int = 3
+    ) -> list[dict[str, Any]]:
+        """Synchronous wrapper for news item enrichment."""
+        return self._run(self.enrich_news_items_async(news_items, limit=limit))
+
     async def get_comprehensive_market_context_async(
         self,
         include_political: bool = True,
@@ -309,7 +416,7 @@ class NewsEnricher:
         results_per_topic: int = 3,
     ) -> dict[str, Any]:
         """Synchronous wrapper for comprehensive market context."""
-        return asyncio.run(
+        return self._run(
             self.get_comprehensive_market_context_async(
                 include_political=include_political,
                 political_topics_limit=political_topics_limit,
@@ -348,7 +455,7 @@ class NewsEnricher:
 
     def search_global_financial_news(self, limit: int = 5) -> list[dict[str, Any]]:
         """Synchronous wrapper for global financial news."""
-        return asyncio.run(self.search_global_financial_news_async(limit))
+        return self._run(self.search_global_financial_news_async(limit))
 
     def enrich_news_with_market_data(
         self, news_items: list[dict[str, Any]]
@@ -360,3 +467,15 @@ class NewsEnricher:
             return news_items
 
         return news_items
+
+    async def aclose(self) -> None:
+        """Close loop-bound HTTP clients owned by this enricher."""
+        await self.marketstack.aclose()
+
+    def close(self) -> None:
+        """Close the HTTP clients and the event loop used by the sync wrappers."""
+        self._runner.close(self.aclose)
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine for a sync wrapper on this enricher's persistent loop."""
+        return self._runner.run(coro)
@@ -1,7 +1,27 @@
-import json
+import asyncio
+import atexit
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import httpx
+from bot_common import fast_json
+from bot_common.http import get_async_client
+
+# Kept open for the life of the process so consecutive webhook posts reuse the
+# TLS connection to discord.com.
+_DISCORD_CLIENT = httpx.Client(
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=90),
+)
+atexit.register(_DISCORD_CLIENT.close)
+
+# Discord rate-limits per webhook; two posts in flight stays well inside it
+_MAX_CONCURRENT_POSTS = 2
+_MAX_RATE_LIMIT_RETRIES = 3
+# Longest Retry-After waited between attempts; larger values are clamped to it
+_MAX_RETRY_AFTER = 30.0
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 def send_discord_webhook(
@@ -10,66 +30,132 @@ def send_discord_webhook(
     if not news_items:
         return
 
-    with httpx.Client() as client:
-        # Discord webhooks have limits (10 embeds per message, total size limits).
-        # We'll send them in chunks or just the latest ones.
-        # Let's limit to top 5 to avoid spam for now.
-
-        # Send Summary First (if exists)
-        if summary:
-            # Split summary into chunks of 1900 characters to be safe (Discord limit 2000)
-            # We split by newlines where possible to avoid breaking markdown
-            header = ":flag_vn: **BẢN TIN TÀI CHÍNH HÀNG NGÀY**\n\n"
-            current_message = header
-
-            parts = summary.split("\n")
-
-            for part in parts:
-                if len(current_message) + len(part) + 1 > 1900:
-                    # Send current bucket
-                    payload = {"content": current_message}
-                    _post_to_discord(client, webhook_url, payload)
-                    current_message = part + "\n"
-                else:
-                    current_message += part + "\n"
-
-            # Send remaining
-            if current_message.strip():
-                if current_message == header:
-                    pass
-                else:
-                    payload = {"content": current_message}
-                    _post_to_discord(client, webhook_url, payload)
-
-        chunk_size = 5
-
-        for i in range(0, len(news_items), chunk_size):
-            chunk = news_items[i : i + chunk_size]
-
-            embeds = []
-            for item in chunk:
-                embed = {
-                    "title": item["title"][:250],
-                    "url": item["link"],
-                    "description": item["summary"][:500] + "..."
-                    if len(item["summary"]) > 500
-                    else item["summary"],
-                    "color": 3447003,  # Blueish
-                    "footer": {
-                        "text": f"{item['source']} • {item['published_at'].strftime('%Y-%m-%d %H:%M')}"
-                    },
-                }
-                embeds.append(embed)
-
-            payload = {"embeds": embeds}
-
-            _post_to_discord(client, webhook_url, payload)
+    client = _DISCORD_CLIENT
+
+    # Summary parts must arrive in order
+    for payload in _summary_payloads(summary):
+        _post_to_discord(client, webhook_url, payload)
+
+    # The news chunks are independent, so post them concurrently with a small cap
+    with ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_POSTS) as executor:
+        futures = [
+            executor.submit(_post_to_discord, client, webhook_url, payload)
+            for payload in _embed_payloads(news_items)
+        ]
+        for future in futures:
+            future.result()
+
+
+async def send_discord_webhook_async(
+    webhook_url: str, news_items: list[dict[str, Any]], summary: str = ""
+) -> None:
+    """Like send_discord_webhook, on the shared keep-alive AsyncClient of the running loop."""
+    if not news_items:
+        return
+
+    client = get_async_client()
+
+    # Summary parts must arrive in order
+    for payload in _summary_payloads(summary):
+        await _post_to_discord_async(client, webhook_url, payload)
+
+    # The news chunks are independent, so post them concurrently with a small cap
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_POSTS)
+
+    async def post_chunk(payload: dict[str, Any]) -> None:
+        async with semaphore:
+            await _post_to_discord_async(client, webhook_url, payload)
+
+    await asyncio.gather(*(post_chunk(payload) for payload in _embed_payloads(news_items)))
+
+
+def _summary_payloads(summary: str) -> list[dict[str, Any]]:
+    """Split the summary into messages under Discord's 2000-character limit."""
+    if not summary:
+        return []
+
+    # Split summary into chunks of 1900 characters to be safe (Discord limit 2000)
+    # We split by newlines where possible to avoid breaking markdown
+    header = ":flag_vn: **BẢN TIN TÀI CHÍNH HÀNG NGÀY**\n\n"
+
+    # Collect lines per message and join once, instead of growing a string
+    buckets: list[list[str]] = [header.split("\n")[:-1]]
+    size = len(header)
+
+    for part in summary.split("\n"):
+        if size + len(part) + 1 > 1900:
+            buckets.append([])
+            size = 0
+        buckets[-1].append(part)
+        size += len(part) + 1
+
+    payloads = []
+    for bucket in buckets:
+        message = "\n".join(bucket) + "\n"
+        if message.strip() and message != header:
+            payloads.append({"content": message})
+    return payloads
+
+
+def _embed_payloads(news_items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """News items as embed messages, 5 per message."""
+    # Discord webhooks have limits (10 embeds per message, total size limits).
+    # Let's limit to 5 per message to avoid spam for now.
+    chunk_size = 5
+
+    embed_payloads = []
+    for i in range(0, len(news_items), chunk_size):
+        chunk = news_items[i : i + chunk_size]
+
+        embeds = []
+        for item in chunk:
+            summary = item["summary"]
+            # Same text as strftime("%Y-%m-%d %H:%M"), without strftime's locale machinery
+            published = item["published_at"].isoformat(sep=" ", timespec="minutes")[:16]
+            embed = {
+                "title": item["title"][:250],
+                "url": item["link"],
+                "description": summary if len(summary) <= 500 else summary[:500] + "...",
+                "color": 3447003,  # Blueish
+                "footer": {"text": f"{item['source']} • {published}"},
+            }
+            embeds.append(embed)
+
+        embed_payloads.append({"embeds": embeds})
+    return embed_payloads
 
 
 def _post_to_discord(client: httpx.Client, webhook_url: str, payload: dict[str, Any]) -> None:
-    response = client.post(
-        webhook_url,
-        content=json.dumps(payload),
-        headers={"Content-Type": "application/json"},
-    )
+    body = fast_json.dumps(payload)  # Encoded once, even if the post is retried
+    for attempt in range(_MAX_RATE_LIMIT_RETRIES):
+        response = client.post(webhook_url, content=body, headers=_JSON_HEADERS)
+        if response.status_code != 429 or attempt == _MAX_RATE_LIMIT_RETRIES - 1:
+            break
+        # Rate limited: wait as long as Discord asks, then retry the same payload
+        time.sleep(_retry_after(response))
+    response.raise_for_status()
+
+
+async def _post_to_discord_async(
+    client: httpx.AsyncClient, webhook_url: str, payload: dict[str, Any]
+) -> None:
+    body = fast_json.dumps(payload)  # Encoded once, even if the post is retried
+    for attempt in range(_MAX_RATE_LIMIT_RETRIES):
+        response = await client.post(webhook_url, content=body, headers=_JSON_HEADERS)
+        if response.status_code != 429 or attempt == _MAX_RATE_LIMIT_RETRIES - 1:
+            break
+        # Rate limited: wait as long as Discord asks, then retry the same payload
+        await asyncio.sleep(_retry_after(response))
     response.raise_for_status()
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """
+    Seconds to wait from a Discord 429 (Retry-After header or JSON retry_after),
+    capped at _MAX_RETRY_AFTER so one rate limit cannot stall the run.
+    """
+    try:
+        delay = float(response.headers.get("Retry-After") or response.json()["retry_after"])
+    except (KeyError, TypeError, ValueError):
+        return 1.0
+    return min(max(delay, 0.0), _MAX_RETRY_AFTER)
@@ -3,35 +3,46 @@ SSI iBoard API client for fetching VN30 stock and index data.
 Public API - no API key required.
 """
 
+import asyncio
+import heapq
 import logging
+import os
 import uuid
 from dataclasses import dataclass, field
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Any
 
 import httpx
+from bot_common import fast_json
 
 logger = logging.getLogger(__name__)
 
-# Common headers required by iBoard API
-_IBOARD_HEADERS = {
-    "accept": "application/json, text/plain, */*",
-    "accept-language": "vi",
-    "cache-control": "no-cache",
-    "device-id": str(uuid.uuid4()),
-    "origin": "https://iboard.ssi.com.vn",
-    "pragma": "no-cache",
-    "referer": "https://iboard.ssi.com.vn/",
-    "user-agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/145.0.0.0 Safari/537.36"
-    ),
-}
+# Set SSI_DEVICE_ID to keep the same device id across runs
+_DEVICE_ID = os.environ.get("SSI_DEVICE_ID") or str(uuid.uuid4())
+
+# Common headers required by iBoard API (read-only, shared by all clients)
+_IBOARD_HEADERS = MappingProxyType(
+    {
+        "accept": "application/json, text/plain, */*",
+        "accept-language": "vi",
+        "cache-control": "no-cache",
+        "device-id": _DEVICE_ID,
+        "origin": "https://iboard.ssi.com.vn",
+        "pragma": "no-cache",
+        "referer": "https://iboard.ssi.com.vn/",
+        "user-agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/145.0.0.0 Safari/537.36"
+        ),
+    }
+)
 
 BASE_URL = "https://iboard-query.ssi.com.vn"
 
 
-@dataclass
+@dataclass(slots=True)
 class SSIStockData:
     """Per-stock data from the SSI /stock/group/VN30 endpoint."""
 
@@ -67,6 +78,36 @@ class SSIStockData:
     best1_offer: float = 0
     best1_offer_vol: int = 0
 
+    @classmethod
+    def from_api(cls, item: dict[str, Any]) -> "SSIStockData":
+        """Build from a raw /stock/group/VN30 item (fields in declaration order)."""
+        g = item.get
+        return cls(
+            g("stockSymbol", ""),
+            g("companyNameEn", ""),
+            g("exchange", ""),
+            g("matchedPrice", 0),
+            g("refPrice", 0),
+            g("ceiling", 0),
+            g("floor", 0),
+            g("openPrice", 0),
+            g("highest", 0),
+            g("lowest", 0),
+            g("avgPrice", 0),
+            g("priceChange", 0),
+            g("priceChangePercent", 0),
+            g("nmTotalTradedQty", 0),
+            g("nmTotalTradedValue", 0),
+            g("buyForeignQtty", 0),
+            g("buyForeignValue", 0),
+            g("sellForeignQtty", 0),
+            g("sellForeignValue", 0),
+            g("best1Bid", 0),
+            g("best1BidVol", 0),
+            g("best1Offer", 0),
+            g("best1OfferVol", 0),
+        )
+
     @property
     def foreign_net_qtty(self) -> int:
         """Net foreign quantity (positive = net buy)."""
@@ -78,7 +119,7 @@ class SSIStockData:
         return self.buy_foreign_value - self.sell_foreign_value
 
 
-@dataclass
+@dataclass(slots=True)
 class SSIIndexData:
     """VN30 index data from the /exchange-index/VN30 endpoint."""
 
@@ -119,20 +160,26 @@ class SSIClient:
     Public API - no authentication required.
     """
 
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, client: httpx.Client | None = None):
         self.timeout = timeout
-        self._client = httpx.Client(timeout=timeout, headers=_IBOARD_HEADERS)
+        # An injected client is shared with the caller, who is responsible for closing it.
+        # Our own client carries the iBoard headers as defaults; a shared one gets them
+        # per request.
+        self._client = client or httpx.Client(timeout=timeout, headers=_IBOARD_HEADERS)
+        self._owns_client = client is None
+        self._request_headers = None if self._owns_client else _IBOARD_HEADERS
 
     def close(self) -> None:
-        """Close the underlying HTTP client."""
-        self._client.close()
+        """Close the underlying HTTP client if this instance created it."""
+        if self._owns_client:
+            self._client.close()
 
     def _get(self, path: str) -> dict[str, Any] | list:
         """Send GET request to iBoard API."""
         url = f"{BASE_URL}{path}"
-        response = self._client.get(url)
+        response = self._client.get(url, headers=self._request_headers, timeout=self.timeout)
         response.raise_for_status()
-        data = response.json()
+        data = fast_json.loads(response.content)
 
         if data.get("code") != "SUCCESS":
             msg = data.get("message", "Unknown error")
@@ -150,7 +197,7 @@ class SSIClient:
         try:
             raw_stocks = self._get("/stock/group/VN30")
         except Exception as e:
-            logger.error(f"Failed to fetch VN30 stocks from SSI: {e}")
+            logger.error("Failed to fetch VN30 stocks from SSI: %s", e)
             return []
 
         if not isinstance(raw_stocks, list):
@@ -160,51 +207,30 @@ class SSIClient:
         stocks = []
         for item in raw_stocks:
             try:
-                stocks.append(
-                    SSIStockData(
-                        stock_symbol=item.get("stockSymbol", ""),
-                        company_name=item.get("companyNameEn", ""),
-                        exchange=item.get("exchange", ""),
-                        matched_price=item.get("matchedPrice", 0),
-                        ref_price=item.get("refPrice", 0),
-                        ceiling=item.get("ceiling", 0),
-                        floor=item.get("floor", 0),
-                        open_price=item.get("openPrice", 0),
-                        highest=item.get("highest", 0),
-                        lowest=item.get("lowest", 0),
-                        avg_price=item.get("avgPrice", 0),
-                        price_change=item.get("priceChange", 0),
-                        price_change_percent=item.get("priceChangePercent", 0),
-                        total_volume=item.get("nmTotalTradedQty", 0),
-                        total_value=item.get("nmTotalTradedValue", 0),
-                        buy_foreign_qtty=item.get("buyForeignQtty", 0),
-                        buy_foreign_value=item.get("buyForeignValue", 0),
-                        sell_foreign_qtty=item.get("sellForeignQtty", 0),
-                        sell_foreign_value=item.get("sellForeignValue", 0),
-                        best1_bid=item.get("best1Bid", 0),
-                        best1_bid_vol=item.get("best1BidVol", 0),
-                        best1_offer=item.get("best1Offer", 0),
-                        best1_offer_vol=item.get("best1OfferVol", 0),
-                    )
-                )
+                stocks.append(SSIStockData.from_api(item))
             except Exception as e:
                 symbol = item.get("stockSymbol", "unknown")
-                logger.warning(f"Failed to parse SSI stock data for {symbol}: {e}")
+                logger.warning("Failed to parse SSI stock data for %s: %s", symbol, e)
 
-        logger.info(f"Fetched {len(stocks)} VN30 stocks from SSI")
+        logger.info("Fetched %d VN30 stocks from SSI", len(stocks))
         return stocks
 
-    def get_vn30_index(self) -> SSIIndexData | None:
+    def get_vn30_index(self, include_history: bool = True) -> SSIIndexData | None:
         """
-        Fetch VN30 index data with intraday chart history.
+        Fetch VN30 index data, optionally with intraday chart history.
+
+        Args:
+            include_history: Request the intraday tick history. It is the bulk
+                of the response, so skip it when only the snapshot is needed.
 
         Returns:
             SSIIndexData with index value, breadth, and chart history, or None.
         """
+        path = "/exchange-index/VN30?hasHistory=true" if include_history else "/exchange-index/VN30"
         try:
-            raw = self._get("/exchange-index/VN30?hasHistory=true")
+            raw = self._get(path)
         except Exception as e:
-            logger.error(f"Failed to fetch VN30 index from SSI: {e}")
+            logger.error("Failed to fetch VN30 index from SSI: %s", e)
             return None
 
         if not isinstance(raw, dict):
@@ -228,16 +254,20 @@ class SSIClient:
                 total_value=raw.get("totalValue", 0),
                 total_buy_foreign_qtty=raw.get("totalBuyForeignQtty", 0),
                 total_sell_foreign_qtty=raw.get("totalSellForeignQtty", 0),
-                history=raw.get("history", []),
+                # Kept as the decoded list (no copy); only read by intraday charting
+                history=raw.get("history") or [],
             )
         except Exception as e:
-            logger.error(f"Failed to parse SSI VN30 index data: {e}")
+            logger.error("Failed to parse SSI VN30 index data: %s", e)
             return None
 
-    def get_market_summary(self) -> dict[str, Any]:
+    async def aget_market_summary(self) -> dict[str, Any]:
         """
         Aggregate VN30 market summary from both SSI endpoints.
 
+        The stocks and index requests are independent, so they run
+        concurrently on worker threads sharing the client's connection pool.
+
         Returns:
             Dictionary with:
             - index: SSIIndexData dict
@@ -248,9 +278,21 @@ class SSIClient:
             - top_gainers: top 5 stocks by price change %
             - top_losers: bottom 5 stocks by price change %
         """
-        stocks = self.get_vn30_stocks()
-        index = self.get_vn30_index()
+        stocks, index = await asyncio.gather(
+            asyncio.to_thread(self.get_vn30_stocks),
+            # The summary never reads the tick history, so don't download it
+            asyncio.to_thread(self.get_vn30_index, include_history=False),
+        )
+        return self._build_market_summary(stocks, index)
+
+    def get_market_summary(self) -> dict[str, Any]:
+        """Synchronous wrapper for aget_market_summary."""
+        return asyncio.run(self.aget_market_summary())
 
+    def _build_market_summary(
+        self, stocks: list[SSIStockData], index: SSIIndexData | None
+    ) -> dict[str, Any]:
+        """Shape raw stocks and index data into the market summary dict."""
         summary: dict[str, Any] = {
             "index": None,
             "stocks": [],
@@ -284,9 +326,15 @@ class SSIClient:
         if not stocks:
             return summary
 
-        # Stock list (compact)
+        # Stock list (compact), foreign totals and sort keys in a single pass
         stock_dicts = []
+        foreign_rows = []
+        change_rows = []
+        total_buy_val = 0.0
+        total_sell_val = 0.0
         for s in stocks:
+            net_qtty = s.foreign_net_qtty
+            net_value = s.foreign_net_value
             stock_dicts.append(
                 {
                     "symbol": s.stock_symbol,
@@ -296,61 +344,47 @@ class SSIClient:
                     "change_percent": s.price_change_percent,
                     "volume": s.total_volume,
                     "value": s.total_value,
-                    "foreign_net_qtty": s.foreign_net_qtty,
-                    "foreign_net_value": s.foreign_net_value,
+                    "foreign_net_qtty": net_qtty,
+                    "foreign_net_value": net_value,
                     "buy_foreign_qtty": s.buy_foreign_qtty,
                     "sell_foreign_qtty": s.sell_foreign_qtty,
                 }
             )
+            foreign_rows.append((net_qtty, net_value, s.stock_symbol))
+            change_rows.append((s.price_change_percent, s.matched_price, s.stock_symbol))
+            total_buy_val += s.buy_foreign_value
+            total_sell_val += s.sell_foreign_value
         summary["stocks"] = stock_dicts
 
         # Foreign flow aggregation
-        total_buy_val = sum(s.buy_foreign_value for s in stocks)
-        total_sell_val = sum(s.sell_foreign_value for s in stocks)
         summary["foreign_summary"] = {
             "total_buy_value": total_buy_val,
             "total_sell_value": total_sell_val,
             "net_value": total_buy_val - total_sell_val,
         }
 
-        # Top foreign activity (sorted by net quantity)
-        sorted_by_foreign = sorted(stocks, key=lambda s: s.foreign_net_qtty, reverse=True)
+        # Top foreign activity by net quantity (sells ordered most negative first)
+        by_qtty = itemgetter(0)
         summary["top_foreign_buy"] = [
-            {
-                "symbol": s.stock_symbol,
-                "net_qtty": s.foreign_net_qtty,
-                "net_value": s.foreign_net_value,
-            }
-            for s in sorted_by_foreign[:5]
-            if s.foreign_net_qtty > 0
+            {"symbol": symbol, "net_qtty": net_qtty, "net_value": net_value}
+            for net_qtty, net_value, symbol in heapq.nlargest(5, foreign_rows, key=by_qtty)
+            if net_qtty > 0
         ]
         summary["top_foreign_sell"] = [
-            {
-                "symbol": s.stock_symbol,
-                "net_qtty": s.foreign_net_qtty,
-                "net_value": s.foreign_net_value,
-            }
-            for s in sorted_by_foreign[-5:]
-            if s.foreign_net_qtty < 0
+            {"symbol": symbol, "net_qtty": net_qtty, "net_value": net_value}
+            for net_qtty, net_value, symbol in heapq.nsmallest(5, foreign_rows, key=by_qtty)
+            if net_qtty < 0
         ]
 
-        # Top gainers/losers
-        sorted_by_change = sorted(stocks, key=lambda s: s.price_change_percent, reverse=True)
+        # Top gainers/losers (losers ordered worst first)
+        by_change = itemgetter(0)
         summary["top_gainers"] = [
-            {
-                "symbol": s.stock_symbol,
-                "price": s.matched_price,
-                "change_percent": s.price_change_percent,
-            }
-            for s in sorted_by_change[:5]
+            {"symbol": symbol, "price": price, "change_percent": change_percent}
+            for change_percent, price, symbol in heapq.nlargest(5, change_rows, key=by_change)
         ]
         summary["top_losers"] = [
-            {
-                "symbol": s.stock_symbol,
-                "price": s.matched_price,
-                "change_percent": s.price_change_percent,
-            }
-            for s in sorted_by_change[-5:]
+            {"symbol": symbol, "price": price, "change_percent": change_percent}
+            for change_percent, price, symbol in heapq.nsmallest(5, change_rows, key=by_change)
         ]
 
         return summary
@@ -3,15 +3,30 @@ Stock client for fetching Vietnam stock prices using DSC Securities API.
 """
 
 import datetime
+import heapq
 import logging
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any
 
+from bot_common.disk_cache import DiskTTLCache
+from bot_common.ttl_cache import TTLCache
+
 from .dsc_client import DSCClient
 from .ssi_client import SSIClient
 
 logger = logging.getLogger(__name__)
 
+# VN30 composition changes at most quarterly; reuse it across runs for a week,
+# comfortably longer than the daily schedule so the next run reliably hits
+VN30_SYMBOLS_TTL = 7 * 24 * 3600
+_VN30_SYMBOLS_CACHE = DiskTTLCache("data/vn30_symbols.json", ttl=VN30_SYMBOLS_TTL)
+# A failed fetch is remembered briefly so one run does not hammer DSC
+VN30_FAILURE_TTL = 300
+
+# Fundamentals barely move intraday; shared by every client in the process
+_STOCK_INFO_CACHE = TTLCache(maxsize=512, ttl=3600)
+
 
 @dataclass
 class StockPrice:
@@ -41,6 +56,17 @@ class StockInfo:
     is_vn30: bool = False
 
 
+def _mover_row(price: StockPrice) -> dict[str, Any]:
+    """Top-mover entry as consumed by the summarizer and market enricher."""
+    return {
+        "symbol": price.symbol,
+        "price": price.price,
+        "change": price.change,
+        "change_percent": price.change_percent,
+        "volume": price.volume,
+    }
+
+
 class StockClient:
     """
     Client to fetch Vietnam stock prices from DSC Securities API.
@@ -49,21 +75,40 @@ class StockClient:
 
     def __init__(self, source: str = "VCI"):
         self.source = source
-        self._vn30_cache: set[str] | None = None
+        # Expires like the disk copy, so a long-lived client picks up rebalances
+        self._vn30_cache = TTLCache(maxsize=1, ttl=VN30_SYMBOLS_TTL)
         self.dsc_client = DSCClient()
         self.ssi_client = SSIClient()
 
     def get_vn30_symbols(self) -> set[str]:
-        """Get list of VN30 index component symbols."""
-        if self._vn30_cache is None:
-            try:
-                symbols = self.dsc_client.get_vn30_symbols()
-                self._vn30_cache = set(symbols)
-                logger.info(f"Loaded {len(self._vn30_cache)} VN30 symbols from DSC")
-            except Exception as e:
-                logger.error(f"Error fetching VN30 symbols: {e}")
-                self._vn30_cache = set()
-        return self._vn30_cache
+        """
+        Get the set of VN30 index component symbols.
+
+        Served from the on-disk cache when a recent run already fetched them.
+        """
+        symbols = self._vn30_cache.get("vn30")
+        if symbols is not None:
+            return symbols
+
+        cached = _VN30_SYMBOLS_CACHE.get("vn30")
+        if cached is not None:
+            symbols = set(cached)
+            self._vn30_cache.set("vn30", symbols)
+            return symbols
+
+        try:
+            symbols = set(self.dsc_client.get_vn30_symbols())
+            logger.info("Loaded %d VN30 symbols from DSC", len(symbols))
+        except Exception as e:
+            logger.error("Error fetching VN30 symbols: %s", e)
+            symbols = set()
+
+        if symbols:
+            _VN30_SYMBOLS_CACHE.set("vn30", sorted(symbols))
+            self._vn30_cache.set("vn30", symbols)
+        else:  # DSC failed; retry after a short pause and on the next run
+            self._vn30_cache.set("vn30", symbols, ttl=VN30_FAILURE_TTL)
+        return symbols
 
     def is_vn30(self, symbol: str) -> bool:
         """Check if a stock is in the VN30 index."""
@@ -72,13 +117,20 @@ class StockClient:
     def get_stock_info(self, symbol: str) -> StockInfo | None:
         """
         Fetch company fundamentals via DSC (limited info compared to vnstock).
+
+        Results are cached in-process for an hour; failures are not cached.
         """
+        cache_key = symbol.upper()
+        cached = _STOCK_INFO_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            info = self.dsc_client.get_stock_info(symbol)
+            info = self.dsc_client.get_stock_info(symbol, vn30_symbols=self.get_vn30_symbols())
             if not info:
                 return None
 
-            return StockInfo(
+            stock_info = StockInfo(
                 symbol=info.get("symbol", symbol),
                 company_name=info.get("company_name", ""),
                 industry=info.get("industry", ""),
@@ -88,10 +140,12 @@ class StockClient:
                 pb_ratio=0.0,
                 eps=0.0,
                 roe=0.0,
-                is_vn30=self.is_vn30(symbol),
+                is_vn30=info.get("is_vn30", False),
             )
+            _STOCK_INFO_CACHE.set(cache_key, stock_info)
+            return stock_info
         except Exception as e:
-            logger.error(f"Error fetching stock info for {symbol}: {e}")
+            logger.error("Error fetching stock info for %s: %s", symbol, e)
             return None
 
     def get_stock_price(self, symbol: str) -> StockPrice | None:
@@ -117,7 +171,7 @@ class StockClient:
                 )
             return None
         except Exception as e:
-            logger.error(f"Error fetching price for {symbol}: {e}")
+            logger.error("Error fetching price for %s: %s", symbol, e)
             return None
 
     def get_stock_prices(self, symbols: list[str]) -> dict[str, StockPrice]:
@@ -144,7 +198,7 @@ class StockClient:
                 )
             return results
         except Exception as e:
-            logger.error(f"Error fetching stock prices: {e}")
+            logger.error("Error fetching stock prices: %s", e)
             return {}
 
     def enrich_fund_holdings(self, holdings: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -155,36 +209,40 @@ class StockClient:
             holdings: List of holdings from fmarket (with 'stock_code' key)
 
         Returns:
-            Holdings with added live price data and comparison.
+            Holdings with added live price data and comparison. Holdings without
+            a live price are the input dicts themselves, not copies.
         """
-        # Extract unique stock codes
-        stock_codes = [h.get("stock_code") for h in holdings if h.get("stock_code")]
-        stock_codes = list(set(stock_codes))
+        # Extract unique stock codes, keeping holding order
+        stock_codes = list(dict.fromkeys(h["stock_code"] for h in holdings if h.get("stock_code")))
 
         # Fetch live prices
         live_prices = self.get_stock_prices(stock_codes)
 
-        # Enrich holdings
+        # Enrich holdings; ones without a live price are passed through uncopied
         enriched = []
         for holding in holdings:
             code = holding.get("stock_code")
-            enriched_holding = holding.copy()
-
-            if code and code in live_prices:
-                live = live_prices[code]
-                enriched_holding["live_price"] = live.price
-                enriched_holding["live_change"] = live.change
-                enriched_holding["live_change_percent"] = live.change_percent
-                enriched_holding["live_volume"] = live.volume
-
-                # Compare fmarket price with live price
-                fmarket_price = holding.get("price", 0)
-                if fmarket_price and live.price:
-                    price_diff = live.price - fmarket_price
-                    enriched_holding["price_diff"] = round(price_diff, 2)
-                    enriched_holding["price_diff_percent"] = (
-                        round((price_diff / fmarket_price) * 100, 2) if fmarket_price > 0 else 0
-                    )
+            live = live_prices.get(code) if code else None
+            if live is None:
+                enriched.append(holding)
+                continue
+
+            enriched_holding = {
+                **holding,
+                "live_price": live.price,
+                "live_change": live.change,
+                "live_change_percent": live.change_percent,
+                "live_volume": live.volume,
+            }
+
+            # Compare fmarket price with live price
+            fmarket_price = holding.get("price", 0)
+            if fmarket_price and live.price:
+                price_diff = live.price - fmarket_price
+                enriched_holding["price_diff"] = round(price_diff, 2)
+                enriched_holding["price_diff_percent"] = (
+                    round((price_diff / fmarket_price) * 100, 2) if fmarket_price > 0 else 0
+                )
 
             enriched.append(enriched_holding)
 
@@ -202,7 +260,7 @@ class StockClient:
             if index_data and index_data.history:
                 return index_data.history
         except Exception as e:
-            logger.error(f"Error fetching VN30 intraday history from SSI: {e}")
+            logger.error("Error fetching VN30 intraday history from SSI: %s", e)
         return []
 
     def get_vn30_ssi_data(self) -> dict[str, Any]:
@@ -216,7 +274,7 @@ class StockClient:
         try:
             return self.ssi_client.get_market_summary()
         except Exception as e:
-            logger.error(f"Error fetching SSI VN30 data: {e}")
+            logger.error("Error fetching SSI VN30 data: %s", e)
             return {}
 
     def get_vn30_index(self) -> dict[str, Any]:
@@ -238,7 +296,7 @@ class StockClient:
                     "volume": vn30.volume,
                 }
         except Exception as e:
-            logger.error(f"Error fetching VN30 index: {e}")
+            logger.error("Error fetching VN30 index: %s", e)
         return {}
 
     def get_vn30_top_movers(self, limit: int = 5) -> dict[str, list[dict[str, Any]]]:
@@ -258,21 +316,12 @@ class StockClient:
         # Fetch prices for all VN30 stocks
         prices = self.get_stock_prices(vn30_symbols)
 
-        # Convert to list and sort
-        stock_list = [
-            {
-                "symbol": p.symbol,
-                "price": p.price,
-                "change": p.change,
-                "change_percent": p.change_percent,
-                "volume": p.volume,
-            }
-            for p in prices.values()
-        ]
-
-        sorted_by_change = sorted(stock_list, key=lambda x: x["change_percent"], reverse=True)
+        # Partial selection: only 2 * limit of the prices are ever ordered
+        by_change = attrgetter("change_percent")
+        gainers = heapq.nlargest(limit, prices.values(), key=by_change)
+        losers = heapq.nsmallest(limit, prices.values(), key=by_change)  # Worst first
 
         return {
-            "gainers": sorted_by_change[:limit],
-            "losers": sorted_by_change[-limit:][::-1],  # Reverse to show worst first
+            "gainers": [_mover_row(p) for p in gainers],
+            "losers": [_mover_row(p) for p in losers],
         }
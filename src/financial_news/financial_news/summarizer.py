@@ -1,17 +1,45 @@
+import atexit
+import hashlib
 import logging
 import os
+import re
 from typing import Any
 
 import httpx
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+from bot_common import fast_json
+from bot_common.ttl_cache import TTLCache
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 logger = logging.getLogger(__name__)
 
+# Rate limiting and server-side failures are worth retrying; other 4xx are not
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Summaries keyed by a hash of the rendered prompt, so identical inputs within
+# a tick (e.g. two handlers firing together) cost one LLM call
+_SUMMARY_CACHE = TTLCache(maxsize=32, ttl=600)
+
+# Kept open for the life of the process so summaries and their retries reuse
+# the TLS connection to api.z.ai instead of handshaking on every attempt.
+_ZAI_CLIENT = httpx.Client(
+    timeout=httpx.Timeout(180.0, read=60.0),
+    limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=120),
+)
+atexit.register(_ZAI_CLIENT.close)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry network errors/timeouts and 429/5xx responses, give up on anything else."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
 # =============================================================================
 # OPTIMIZED PROMPT (Using prompt-engineering-patterns skill)
 # =============================================================================
 
-FINANCIAL_ANALYSIS_PROMPT = """
+FINANCIAL_ANALYSIS_PROMPT_STATIC = """
 # CONTEXT
 You are a senior financial analyst at a top-tier securities firm in Vietnam. You specialize in synthesizing complex market data into actionable insights for retail investors.
 
@@ -45,14 +73,56 @@ Before generating the final response, perform this checklist:
 
 *Instructions: Perform the analysis steps, verify against the checklist, and then output ONLY the final Vietnamese response.*
 
-# INPUT DATA
-## Market Data
-{market_data}
+"""
+
+# Only this section changes between briefings; the framework above is a constant.
+# It has two slots, so it is assembled by joining fixed pieces around them
+# rather than re-parsing a format string on every call.
+INPUT_DATA_PREFIX = "# INPUT DATA\n## Market Data\n"
+INPUT_DATA_MID = "\n\n## News Headlines\n"
+
+# The whole framework goes in the system message, identical on every request, so
+# providers that cache prompt prefixes can reuse it; the user message carries only
+# the per-briefing data.
+SYSTEM_PROMPT = (
+    "You are a specialized financial analysis AI. "
+    "Follow the CO-STAR framework and instructions below exactly.\n"
+    + FINANCIAL_ANALYSIS_PROMPT_STATIC
+)
+
+# Several briefings can share one request; beyond ~4 the answers get shallower
+BATCH_SIZE = 4
+
+BATCH_INSTRUCTIONS = """# BATCH MODE
+The input below contains {count} independent briefings. Write one complete response per briefing,
+following all rules in the system message for each. Start each response with its marker on its own line,
+exactly `---BRIEFING n---` where n is the briefing number, and output nothing else.
 
-## News Headlines
-{news_headlines}
 """
 
+_BRIEFING_MARKER = re.compile(r"^---BRIEFING (\d+)---\s*$", re.MULTILINE)
+
+
+def _format_fund_line(fund: dict[str, Any]) -> str:
+    """One prompt line per fund: returns plus up to 3 top holdings."""
+    get = fund.get
+    nav_6m = get("nav_6m", 0) or 0
+    nav_12m = get("nav_12m", 0) or 0
+    holdings = get("top_holdings")
+
+    line = f"- {fund['name']}: 6M {nav_6m:.1f}%, 12M {nav_12m:.1f}%"
+    if holdings:
+        top_3 = ", ".join(h["stock_code"] for h in holdings[:3])
+        return f"{line} | Holdings: {top_3}"
+    return line
+
+
+def _format_movers(movers: list[dict[str, Any]]) -> str:
+    """'SYM (+1.23%), ...' for a list of mover dicts."""
+    return ", ".join(
+        f"{sym} ({pct:+.2f}%)" for sym, pct in ((m["symbol"], m["change_percent"]) for m in movers)
+    )
+
 
 class NewsSummarizer:
     """Summarizes financial news using Z.AI GLM-4.7 with optimized prompts."""
@@ -64,29 +134,51 @@ class NewsSummarizer:
         self.max_retries = 5
 
     @retry(
-        stop=stop_after_attempt(10),
-        wait=wait_fixed(2),
-        retry=retry_if_exception_type(Exception),
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        retry=retry_if_exception(_is_retryable),
         reraise=True,
     )
     def _call_zai_api(self, messages: list[dict[str, str]]) -> str:
-        """Call Z.AI API with tenacity retry logic."""
-        response = httpx.post(
+        """
+        Call Z.AI API with tenacity retry logic.
+
+        The completion is streamed (SSE) and accumulated, so a stalled or broken
+        stream fails on the read timeout instead of after the full 180 s.
+        """
+        payload = {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": 0.3,
+            "stream": True,
+        }
+        with _ZAI_CLIENT.stream(
+            "POST",
             f"{self.base_url}/chat/completions",
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             },
-            json={
-                "model": self.model_name,
-                "messages": messages,
-                "temperature": 0.3,
-            },
-            timeout=180.0,
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"].strip()
+            content=fast_json.dumps(payload),
+        ) as response:
+            response.raise_for_status()
+
+            # Some gateways ignore "stream" and answer with a plain completion
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                data = fast_json.loads(response.read())
+                return data["choices"][0]["message"]["content"].strip()
+
+            chunks = []
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data_line = line[5:].strip()
+                if data_line == "[DONE]":
+                    break
+                choices = fast_json.loads(data_line).get("choices") or [{}]
+                chunks.append(choices[0].get("delta", {}).get("content") or "")
+
+        return "".join(chunks).strip()
 
     def summarize(
         self, news_items: list[dict[str, Any]], market_stats: dict[str, Any] = None
@@ -98,64 +190,124 @@ class NewsSummarizer:
         if not news_items:
             return ""
 
-        market_stats = market_stats or {}
+        prompt = self._build_input_data(news_items, market_stats or {})
 
-        # Prepare news text
-        news_text = ""
-        for i, item in enumerate(news_items, 1):
-            news_text += f"{i}. [{item['source']}] {item['title']}: {item['summary'][:200]}\n"
-
-        # Format Market Data
-        market_data = self._format_all_market_data(market_stats)
-
-        # Build prompt from template
-        prompt = FINANCIAL_ANALYSIS_PROMPT.format(
-            market_data=market_data,
-            news_headlines=news_text,
-        )
+        # The prompt is a canonical rendering of the inputs the model sees
+        cache_key = hashlib.sha1(f"{self.model_name}\n{prompt}".encode()).hexdigest()
+        cached = _SUMMARY_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info("Reusing cached summary for identical inputs")
+            return cached
 
         messages = [
-            {
-                "role": "system",
-                "content": "You are a specialized financial analysis AI. Follow the provided CO-STAR framework and instructions exactly.",
-            },
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ]
 
-        return self._call_zai_api(messages)
+        summary = self._call_zai_api(messages)
+        _SUMMARY_CACHE.set(cache_key, summary)
+        return summary
+
+    def summarize_batch(
+        self, briefings: list[tuple[list[dict[str, Any]], dict[str, Any] | None]]
+    ) -> list[str]:
+        """
+        Summarize several briefings, up to BATCH_SIZE per Z.AI request.
+
+        Args:
+            briefings: (news_items, market_stats) pairs, as passed to summarize
+
+        Returns:
+            One summary per briefing, in input order.
+        """
+        if not self.api_key or len(briefings) == 1:
+            return [self.summarize(news, stats) for news, stats in briefings]
+
+        summaries = [""] * len(briefings)
+        # Briefings without news get "" just like summarize()
+        pending = [i for i, (news, _) in enumerate(briefings) if news]
+
+        for start in range(0, len(pending), BATCH_SIZE):
+            group = pending[start : start + BATCH_SIZE]
+            if len(group) == 1:
+                summaries[group[0]] = self.summarize(*briefings[group[0]])
+                continue
+
+            blocks = [
+                f"### Briefing {n}\n" + self._build_input_data(news, stats or {})
+                for n, (news, stats) in enumerate((briefings[i] for i in group), 1)
+            ]
+            prompt = BATCH_INSTRUCTIONS.format(count=len(group)) + "\n".join(blocks)
+            messages = [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ]
+
+            outputs = self._split_briefings(self._call_zai_api(messages), len(group))
+            if outputs is None:
+                logger.warning("Batched summary was malformed; summarizing individually")
+                outputs = [self.summarize(*briefings[i]) for i in group]
+
+            for i, output in zip(group, outputs, strict=True):
+                summaries[i] = output
+
+        return summaries
+
+    def _build_input_data(
+        self, news_items: list[dict[str, Any]], market_stats: dict[str, Any]
+    ) -> str:
+        """Format the per-briefing INPUT DATA section of the prompt."""
+        news_lines = [
+            f"{i}. [{item['source']}] {item['title']}: {item['summary'][:200]}"
+            for i, item in enumerate(news_items, 1)
+        ]
+        return "".join(
+            (
+                INPUT_DATA_PREFIX,
+                self._format_all_market_data(market_stats),
+                INPUT_DATA_MID,
+                "\n".join(news_lines),
+                "\n\n",
+            )
+        )
+
+    @staticmethod
+    def _split_briefings(text: str, count: int) -> list[str] | None:
+        """Split a batched response on its markers; None unless briefings 1..count all appear."""
+        parts = _BRIEFING_MARKER.split(text)
+        # parts = [preamble, n1, body1, n2, body2, ...]
+        bodies = {int(n): body.strip() for n, body in zip(parts[1::2], parts[2::2], strict=True)}
+        if sorted(bodies) != list(range(1, count + 1)):
+            return None
+        return [bodies[n] for n in range(1, count + 1)]
 
     def _format_all_market_data(self, market_stats: dict[str, Any]) -> str:
         """Format all market data into a single string for the prompt."""
         parts = []
+        get = market_stats.get
 
         # VN30 Current Index (Real-time from DSC)
-        if "vn30_current" in market_stats and market_stats["vn30_current"]:
-            vn30 = market_stats["vn30_current"]
+        vn30 = get("vn30_current")
+        if vn30:
             parts.append(
                 f"VN30 Index: {vn30.get('current', 0):,.2f} ({vn30.get('change_percent', 0):+.2f}%), Volume: {vn30.get('volume', 0):,}"
             )
 
         # Top Movers
-        if "top_movers" in market_stats and market_stats["top_movers"]:
-            movers = market_stats["top_movers"]
+        movers = get("top_movers")
+        if movers:
             gainers = movers.get("gainers", [])[:3]
             losers = movers.get("losers", [])[:3]
 
             if gainers:
-                gainer_str = ", ".join(
-                    [f"{g['symbol']} ({g['change_percent']:+.2f}%)" for g in gainers]
-                )
-                parts.append(f"Top Gainers: {gainer_str}")
+                parts.append(f"Top Gainers: {_format_movers(gainers)}")
 
             if losers:
-                loser_str = ", ".join(
-                    [f"{loser['symbol']} ({loser['change_percent']:+.2f}%)" for loser in losers]
-                )
-                parts.append(f"Top Losers: {loser_str}")
+                parts.append(f"Top Losers: {_format_movers(losers)}")
 
         # Gold Prices & History
-        if "gold_prices" in market_stats and market_stats["gold_prices"]:
-            g = market_stats["gold_prices"]
+        g = get("gold_prices")
+        if g:
             parts.append(
                 f"Market Gold Rates (Latest): SJC {g.get('sjc_buy')}/{g.get('sjc_sell')}, "
                 f"Ring {g.get('ring_buy')}/{g.get('ring_sell')}, "
@@ -166,8 +318,6 @@ class NewsSummarizer:
             history = g.get("history", [])
             if history:
                 # History items have keys: date (YYYY-MM-DD), sjc_buy, sjc_sell
-                # Sort by date
-                history.sort(key=lambda x: x.get("date", ""))
 
                 # Helper to format date and price
                 def fmt_item(item):
@@ -176,13 +326,23 @@ class NewsSummarizer:
                     price_str = f"{price:,.0f}" if price else "N/A"
                     return f"{date_str}: {price_str}"
 
-                start = history[0]
-                end = history[-1]
-
-                # Find min/max in history
-                prices = [x.get("sjc_sell", 0) for x in history if x.get("sjc_sell")]
-                min_p = min(prices) if prices else 0
-                max_p = max(prices) if prices else 0
+                # One pass for the earliest/latest entries and the price range;
+                # no sort needed since only the extremes are used
+                start = end = history[0]
+                start_date = end_date = start.get("date", "")
+                min_p = max_p = 0
+                for item in history:
+                    d = item.get("date", "")
+                    if d < start_date:
+                        start, start_date = item, d
+                    elif d >= end_date:
+                        end, end_date = item, d
+                    p = item.get("sjc_sell")
+                    if p:
+                        if not min_p or p < min_p:
+                            min_p = p
+                        if p > max_p:
+                            max_p = p
 
                 parts.append(
                     f"Gold 12-Month Trend (SJC Sell): Start {fmt_item(start)} -> End {fmt_item(end)}"
@@ -190,55 +350,36 @@ class NewsSummarizer:
                 parts.append(f"12-Month Range: Low {min_p:,.0f} - High {max_p:,.0f}")
 
         # Watchlist Funds
-        if "watchlist_funds" in market_stats and market_stats["watchlist_funds"]:
-            funds = market_stats["watchlist_funds"]
-            fund_lines = []
-            for f in funds:
-                line = (
-                    f"- {f['name']}: 6M {f.get('nav_6m', 0):.1f}%, 12M {f.get('nav_12m', 0):.1f}%"
-                )
-                if "top_holdings" in f and f["top_holdings"]:
-                    top_3 = [h["stock_code"] for h in f["top_holdings"][:3]]
-                    line += f" | Holdings: {', '.join(top_3)}"
-                fund_lines.append(line)
-            if fund_lines:
-                parts.append("Watchlist Funds:\n" + "\n".join(fund_lines))
+        watchlist = get("watchlist_funds") or ()
+        if watchlist:
+            fund_lines = [_format_fund_line(f) for f in watchlist]
+            parts.append("Watchlist Funds:\n" + "\n".join(fund_lines))
 
         # Top Funds
+        # Watchlist ids looked up once, so skipping duplicates is a set lookup
+        watchlist_ids = frozenset(w["id"] for w in watchlist)
 
-        if "top_funds" in market_stats:
-            funds = market_stats["top_funds"]
-            fund_lines = []
-            for f in funds[:5]:
-                # Avoid duplicates if in watchlist
-                if "watchlist_funds" in market_stats and any(
-                    w["id"] == f["id"] for w in market_stats["watchlist_funds"]
-                ):
-                    continue
-
-                line = (
-                    f"- {f['name']}: 6M {f.get('nav_6m', 0):.1f}%, 12M {f.get('nav_12m', 0):.1f}%"
-                )
-                if "top_holdings" in f and f["top_holdings"]:
-                    top_3 = [h["stock_code"] for h in f["top_holdings"][:3]]
-                    line += f" | Holdings: {', '.join(top_3)}"
-                fund_lines.append(line)
+        funds = get("top_funds")
+        if funds:
+            # Avoid duplicates if in watchlist
+            fund_lines = [_format_fund_line(f) for f in funds[:5] if f["id"] not in watchlist_ids]
             if fund_lines:
                 parts.append("Top Performing Funds:\n" + "\n".join(fund_lines))
 
         # Bank Rates
-        if "bank_rates" in market_stats and market_stats["bank_rates"]:
-            rates = [f"{r['bank']}: {r['rate_12m']}%" for r in market_stats["bank_rates"][:3]]
+        bank_rates = get("bank_rates")
+        if bank_rates:
+            rates = [f"{r['bank']}: {r['rate_12m']}%" for r in bank_rates[:3]]
             parts.append(f"Interest Rates (12m): {', '.join(rates)}")
 
         # VN30 Symbols
-        if "vn30_symbols" in market_stats and market_stats["vn30_symbols"]:
-            symbols = market_stats["vn30_symbols"][:10]
-            parts.append(f"VN30 Components: {', '.join(symbols)}")
+        symbols = get("vn30_symbols")
+        if symbols:
+            parts.append(f"VN30 Components: {', '.join(symbols[:10])}")
 
         # SSI VN30 Real-time Data (foreign flow, breadth, intraday)
-        if "ssi_vn30" in market_stats and market_stats["ssi_vn30"]:
-            ssi = market_stats["ssi_vn30"]
+        ssi = get("ssi_vn30")
+        if ssi:
             ssi_parts = []
 
             # Index from SSI
@@ -283,24 +424,18 @@ class NewsSummarizer:
             # SSI top gainers/losers
             ssi_gainers = ssi.get("top_gainers", [])[:3]
             if ssi_gainers:
-                g_str = ", ".join(
-                    f"{s['symbol']} ({s['change_percent']:+.2f}%)" for s in ssi_gainers
-                )
-                ssi_parts.append(f"SSI Top Gainers: {g_str}")
+                ssi_parts.append(f"SSI Top Gainers: {_format_movers(ssi_gainers)}")
 
             ssi_losers = ssi.get("top_losers", [])[:3]
             if ssi_losers:
-                losers_str = ", ".join(
-                    f"{s['symbol']} ({s['change_percent']:+.2f}%)" for s in ssi_losers
-                )
-                ssi_parts.append(f"SSI Top Losers: {losers_str}")
+                ssi_parts.append(f"SSI Top Losers: {_format_movers(ssi_losers)}")
 
             if ssi_parts:
                 parts.append("\n".join(ssi_parts))
 
         # Perplexity AI Context (Web Research)
-        if "perplexity_context" in market_stats and market_stats["perplexity_context"]:
-            ctx = market_stats["perplexity_context"]
+        ctx = get("perplexity_context")
+        if ctx:
             context_parts = []
 
             if ctx.get("vn30_context"):
@@ -316,10 +451,9 @@ class NewsSummarizer:
                 parts.append("\n---\n**Web Research Context:**\n" + "\n\n".join(context_parts))
 
         # Political/Policy News Context
-        if "political_context" in market_stats and market_stats["political_context"]:
-            parts.append(
-                "\n---\n**Political & Policy News:**\n" + market_stats["political_context"]
-            )
+        political = get("political_context")
+        if political:
+            parts.append("\n---\n**Political & Policy News:**\n" + political)
 
         return "\n\n".join(parts) if parts else "Market data unavailable"
 
@@ -332,19 +466,20 @@ class NewsSummarizer:
         summary_parts = ["**📊 Daily Financial Briefing (Auto-Generated)**\n"]
 
         # Add gold/rates if available
-        if "gold_prices" in market_stats and market_stats["gold_prices"]:
-            g = market_stats["gold_prices"]
+        g = market_stats.get("gold_prices")
+        if g:
             summary_parts.append(
                 f"**Vàng & Tỷ giá:**\n"
                 f"- SJC Mua/Bán: {g.get('sjc_buy')}/{g.get('sjc_sell')}\n"
                 f"- USD/VND: {g.get('usd_vnd')}\n"
             )
 
-        # Add top news headlines
+        # Add top news headlines (header and bullets as one part)
         if news_items:
-            summary_parts.append("\n**Tin nổi bật:**\n")
-            for item in news_items[:5]:
-                summary_parts.append(f"• {item['title'][:100]}\n")
+            summary_parts.append(
+                "\n**Tin nổi bật:**\n"
+                + "".join(f"• {item['title'][:100]}\n" for item in news_items[:5])
+            )
 
         summary_parts.append("\n*⚠️ AI summary unavailable - showing raw data*")
 
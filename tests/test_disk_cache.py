@@ -0,0 +1,28 @@
+"""Unit tests for the JSON-file TTL cache."""
+
+from unittest.mock import patch
+
+from bot_common.disk_cache import DiskTTLCache
+
+
+class TestDiskTTLCache:
+    """Tests for DiskTTLCache."""
+
+    def test_value_survives_a_new_instance(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        DiskTTLCache(path).set("q", [{"title": "Tin"}])
+
+        assert DiskTTLCache(path).get("q") == [{"title": "Tin"}]
+
+    def test_entry_expires_after_ttl(self, tmp_path):
+        cache = DiskTTLCache(str(tmp_path / "cache.json"), ttl=10)
+        with patch("bot_common.disk_cache.time.time", return_value=100.0):
+            cache.set("q", 1)
+        with patch("bot_common.disk_cache.time.time", return_value=111.0):
+            assert cache.get("q", "missing") == "missing"
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "cache.json"
+        path.write_text("{not json")
+
+        assert DiskTTLCache(str(path)).get("q") is None
@@ -0,0 +1,31 @@
+"""Unit tests for the optional-orjson JSON encoder and decoder."""
+
+from unittest.mock import patch
+
+import httpx
+from bot_common import fast_json
+
+
+class TestFastJsonLoads:
+    """Tests for fast_json.loads."""
+
+    def test_decodes_bytes(self):
+        assert fast_json.loads(b'{"symbol": "VNM", "price": 72.5}') == {
+            "symbol": "VNM",
+            "price": 72.5,
+        }
+
+    def test_falls_back_to_stdlib_without_orjson(self):
+        with patch.object(fast_json, "orjson", None):
+            assert fast_json.loads(b'[1, "Ti\\u1ec1n"]') == [1, "Tiền"]
+
+
+class TestFastJsonDumps:
+    """Tests for fast_json.dumps."""
+
+    def test_stdlib_fallback_matches_httpx_json_body(self):
+        payload = {"content": "Bản tin tài chính", "embeds": [{"color": 3447003}]}
+        expected = httpx.Request("POST", "https://hook.test", json=payload).content
+
+        with patch.object(fast_json, "orjson", None):
+            assert fast_json.dumps(payload) == expected
@@ -0,0 +1,49 @@
+"""Unit tests for FmarketClient's gold price fetching."""
+
+import time
+
+import httpx
+import pytest
+from bot_common.ttl_cache import TTLCache
+from financial_news.fmarket_client import FmarketClient
+
+OLD_KEY = "eyJold.payload.sig"
+NEW_KEY = "eyJnew.payload.sig"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(tmp_path, monkeypatch):
+    # Key and gold history files live under ./data
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("financial_news.fmarket_client._MARKET_CACHE", TTLCache())
+
+
+class TestGoldPrices:
+    """Tests for the concurrent vnappmob fetches sharing one API key."""
+
+    def test_expired_key_is_refreshed_once_for_both_vnappmob_calls(self):
+        key_requests = []
+        history_keys = []
+
+        def handler(request):
+            url = str(request.url)
+            if "request_api_key" in url:
+                key_requests.append(url)
+                return httpx.Response(200, text=NEW_KEY)
+            if "freegoldapi" in url:
+                return httpx.Response(200, json={"price": 2000.0})
+            if request.headers["Authorization"] != f"Bearer {NEW_KEY}":
+                return httpx.Response(403)
+            if "date_from" in url:
+                history_keys.append(request.headers["Authorization"])
+                return httpx.Response(200, json={"results": []})
+            return httpx.Response(200, json={"results": [{"sell_1l": 90e6, "buy_1l": 88e6}]})
+
+        client = FmarketClient(client=httpx.Client(transport=httpx.MockTransport(handler)))
+        client._cached_key = (OLD_KEY, time.time())
+
+        result = client.get_gold_prices()
+
+        assert result["sjc_sell"] == 90e6
+        assert history_keys == [f"Bearer {NEW_KEY}"]
+        assert len(key_requests) == 1
@@ -0,0 +1,136 @@
+"""Unit tests for the shared async HTTP client and its users."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from bot_common.http import (
+    aclose_async_client,
+    get_async_client,
+    request_with_backoff,
+    set_host_limit,
+)
+from bot_common.tavily_client import TavilyClient
+
+
+class TestSharedAsyncClient:
+    """Tests for bot_common.http.get_async_client."""
+
+    def test_same_loop_shares_one_client(self):
+        async def run() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
+            try:
+                return get_async_client(), get_async_client()
+            finally:
+                await aclose_async_client()
+
+        first, second = asyncio.run(run())
+        assert first is second
+
+    def test_new_loop_gets_a_new_client(self):
+        async def current() -> httpx.AsyncClient:
+            return get_async_client()
+
+        first = asyncio.run(current())
+        second = asyncio.run(current())
+        assert first is not second
+
+    def test_aclose_closes_the_client(self):
+        async def run() -> httpx.AsyncClient:
+            client = get_async_client()
+            await aclose_async_client()
+            return client
+
+        assert asyncio.run(run()).is_closed
+
+
+class TestTavilyClientInjectedClient:
+    """TavilyClient sends its searches through an injected client."""
+
+    def test_searches_use_the_injected_client(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"results": []})
+
+        async def run() -> None:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                tavily = TavilyClient(api_key="test-key", client=client)
+                await asyncio.gather(tavily.search("a"), tavily.search("b"))
+
+        asyncio.run(run())
+        assert len(requests) == 2
+
+    def test_identical_concurrent_searches_share_one_request(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"results": [{"title": "t"}]})
+
+        async def run() -> list[dict]:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                tavily = TavilyClient(api_key="test-key", client=client)
+                return await asyncio.gather(*(tavily.search("same") for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert len(requests) == 1
+        assert all(r == {"results": [{"title": "t"}]} for r in results)
+
+
+class TestRequestWithBackoff:
+    """Tests for bot_common.http.request_with_backoff."""
+
+    @staticmethod
+    def _run(statuses: list[int]) -> tuple[int, int]:
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], text="ok")
+
+        async def run() -> int:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                try:
+                    response = await request_with_backoff(client, "GET", "https://feed.test/rss")
+                    return response.status_code
+                except httpx.HTTPStatusError as e:
+                    return e.response.status_code
+
+        with patch("asyncio.sleep", new=AsyncMock()):
+            status = asyncio.run(run())
+        return status, len(calls)
+
+    def test_transient_status_is_retried(self):
+        assert self._run([503, 200]) == (200, 2)
+
+    def test_client_error_is_not_retried(self):
+        assert self._run([404]) == (404, 1)
+
+    def test_gives_up_after_four_attempts(self):
+        assert self._run([503]) == (503, 4)
+
+    def test_host_limit_caps_concurrent_requests(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, text="ok")
+
+        async def run() -> None:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                await asyncio.gather(
+                    *(
+                        request_with_backoff(client, "GET", "https://limited.test/")
+                        for _ in range(5)
+                    )
+                )
+
+        set_host_limit("limited.test", 2)
+        asyncio.run(run())
+        assert peak == 2
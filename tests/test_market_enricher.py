@@ -0,0 +1,62 @@
+"""Unit tests for MarketEnricher's sync wrappers."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from financial_news.market_enricher import _SEARCH_CACHE, MarketEnricher
+
+
+class TestMarketEnricherEventLoop:
+    """Tests for the persistent event loop behind the sync wrappers."""
+
+    def setup_method(self):
+        _SEARCH_CACHE.clear()
+
+    def test_sync_calls_share_one_loop_until_closed(self):
+        enricher = MarketEnricher()
+        enricher.tavily.api_key = "test-key"
+        loops = []
+
+        async def fake_search(**kwargs):
+            loops.append(asyncio.get_running_loop())
+            return {"results": [{"title": kwargs["query"], "url": "u", "content": "c"}]}
+
+        with patch.object(enricher.tavily, "search", side_effect=fake_search):
+            enricher.search_vn30_context({"change_percent": 1.0})
+            enricher.search_vn30_context({"change_percent": -1.0})
+
+        assert len(loops) == 2
+        assert loops[0] is loops[1]
+
+        with patch.object(enricher, "aclose", new=AsyncMock()) as mock_aclose:
+            enricher.close()
+        mock_aclose.assert_awaited_once()
+        assert loops[0].is_closed()
+
+    def test_sync_wrapper_rejects_running_loop(self):
+        enricher = MarketEnricher()
+        enricher.tavily.api_key = "test-key"
+
+        async def call_sync():
+            enricher.search_vn30_context({"change_percent": 1.0})
+
+        with pytest.raises(RuntimeError, match="_async variant"):
+            asyncio.run(call_sync())
+        assert enricher._runner.loop is None
+
+
+class TestEnrichMarketStats:
+    """Tests for skipping enrichment when there is nothing to search about."""
+
+    def test_sparse_stats_skip_event_loop(self):
+        enricher = MarketEnricher()
+        enricher.tavily.api_key = "test-key"
+        stats = {"vn30_current": {"change_percent": 0}, "top_movers": {"gainers": []}}
+
+        with patch.object(enricher, "_run") as mock_run:
+            result = enricher.enrich_market_stats(stats)
+
+        assert set(result.values()) == {""}
+        mock_run.assert_not_called()
+        assert enricher._runner.loop is None
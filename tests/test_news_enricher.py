@@ -0,0 +1,212 @@
+"""Unit tests for NewsEnricher's political news search."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from bot_common.tavily_client import TavilyClient
+from financial_news.news_enricher import _SEARCH_CACHE, NewsEnricher
+
+
+@pytest.fixture(autouse=True)
+def _clear_search_cache():
+    _SEARCH_CACHE.clear()
+    yield
+    _SEARCH_CACHE.clear()
+
+
+class TestSearchRawCache:
+    """Tests for reusing raw search results within the TTL."""
+
+    def test_repeat_search_hits_cache_unless_disabled(self):
+        enricher = NewsEnricher()
+        enricher.tavily.api_key = "test-key"
+        response = {"results": [{"title": "t", "url": "https://a.vn/x"}]}
+
+        with patch.object(enricher.tavily, "search", new=AsyncMock(return_value=response)) as mock:
+            first = asyncio.run(enricher.search_raw_async("q", include_domains=["a.vn"]))
+            second = asyncio.run(enricher.search_raw_async("q", include_domains=["a.vn"]))
+            assert mock.await_count == 1
+
+            asyncio.run(enricher.search_raw_async("q", include_domains=["a.vn"], use_cache=False))
+            assert mock.await_count == 2
+
+        assert first == second == response["results"]
+
+    def test_reworded_query_shares_cache_entry(self):
+        enricher = NewsEnricher()
+        enricher.tavily.api_key = "test-key"
+        response = {"results": [{"title": "t", "url": "https://a.vn/x"}]}
+
+        with patch.object(enricher.tavily, "search", new=AsyncMock(return_value=response)) as mock:
+            asyncio.run(enricher.search_raw_async("Vietnam monetary policy interest rate"))
+            asyncio.run(enricher.search_raw_async("vietnam  interest rate MONETARY policy"))
+            asyncio.run(enricher.search_raw_async("Vietnam fiscal policy"))
+
+        assert mock.await_count == 2
+
+
+class TestSearchPoliticalNews:
+    """Tests for the concurrent per-topic searches."""
+
+    def test_topics_searched_concurrently_and_merged_in_order(self):
+        enricher = NewsEnricher()
+        enricher.tavily.api_key = "test-key"
+        in_flight = 0
+        peak = 0
+
+        async def fake_search_raw(query, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if query == "broken":
+                raise RuntimeError("boom")
+            # Both topics return the shared URL; the first topic keeps it
+            return [
+                {"title": query, "url": f"https://{query}.vn/a", "content": "c"},
+                {"title": query, "url": "https://shared.vn/x", "content": "c"},
+            ]
+
+        with patch.object(enricher, "search_raw_async", side_effect=fake_search_raw):
+            items = asyncio.run(
+                enricher.search_political_news_async(topics=["one", "broken", "two"])
+            )
+
+        assert peak == 3
+        assert [(i["title"], i["source"]) for i in items] == [
+            ("one", "one.vn"),
+            ("one", "shared.vn"),
+            ("two", "two.vn"),
+        ]
+
+    def test_max_items_stops_early_and_cancels_pending_searches(self):
+        enricher = NewsEnricher()
+        enricher.tavily.api_key = "test-key"
+        cancelled = []
+
+        async def fake_search_raw(query, **kwargs):
+            if query == "slow":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(query)
+                    raise
+            return [{"title": query, "url": f"https://{query}.vn/{i}"} for i in range(3)]
+
+        with patch.object(enricher, "search_raw_async", side_effect=fake_search_raw):
+            items = asyncio.run(
+                enricher.search_political_news_async(topics=["fast", "slow"], max_items=2)
+            )
+
+        assert [i["url"] for i in items] == ["https://fast.vn/0", "https://fast.vn/1"]
+        assert cancelled == ["slow"]
+
+    def test_max_items_cancels_tavily_requests_in_flight(self):
+        enricher = NewsEnricher()
+        cancelled = []
+
+        async def handler(request):
+            query = json.loads(request.content)["query"]
+            if query == "slow":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(query)
+                    raise
+            results = [{"title": query, "url": f"https://{query}.vn/{i}"} for i in range(3)]
+            return httpx.Response(200, json={"results": results})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                enricher.tavily = TavilyClient(api_key="test-key", client=client)
+                items = await enricher.search_political_news_async(
+                    topics=["fast", "slow"], max_items=2
+                )
+                # Unwound before returning, not left for the client shutdown to cut off
+                assert cancelled == ["slow"]
+                assert not enricher.tavily._inflight
+                return items
+
+        items = asyncio.run(run())
+        assert [i["url"] for i in items] == ["https://fast.vn/0", "https://fast.vn/1"]
+
+
+class TestSyncWrappers:
+    """Tests for the persistent event loop behind NewsEnricher's sync wrappers."""
+
+    def test_sync_searches_share_one_loop_until_closed(self):
+        enricher = NewsEnricher()
+        enricher.tavily.api_key = "test-key"
+        loops = []
+
+        async def fake_context(query, **kwargs):
+            loops.append(asyncio.get_running_loop())
+            return f"context for {query}"
+
+        with patch.object(enricher.tavily, "get_search_context", side_effect=fake_context):
+            assert enricher.search("first") == "context for first"
+            assert enricher.search("second") == "context for second"
+
+        assert len(loops) == 2
+        assert loops[0] is loops[1]
+
+        enricher.close()
+        assert loops[0].is_closed()
+        assert enricher._runner.loop is None
+
+
+class TestFormatPoliticalNews:
+    """Tests for format_political_news_for_summary."""
+
+    def test_reads_only_up_to_limit_from_an_iterator(self):
+        items = iter(
+            [
+                {"title": "A", "source": "a.vn", "content": "Rates"},
+                {"title": "B", "source": "b.vn", "content": ""},
+                {"title": "C", "source": "c.vn", "content": ""},
+            ]
+        )
+
+        text = NewsEnricher().format_political_news_for_summary(items, limit=2)
+
+        assert text == (
+            "## Political & Policy News Affecting Markets\n\n"
+            "**1. A**\n   Source: a.vn\n   Summary: Rates...\n\n"
+            "**2. B**\n   Source: b.vn\n"
+        )
+        assert next(items)["title"] == "C"
+
+    def test_no_items_gives_empty_string(self):
+        assert NewsEnricher().format_political_news_for_summary([]) == ""
+
+
+class TestEnrichNewsItems:
+    """Tests for enrich_news_items_async."""
+
+    def test_empty_contexts_are_replaced_from_further_down(self):
+        enricher = NewsEnricher()
+        enricher.tavily.api_key = "test-key"
+        items = [{"title": t, "summary": "s"} for t in ("a", "miss", "", "b", "c", "d")]
+        batches = []
+
+        async def fake_search(query, **kwargs):
+            batches.append(query)
+            return "" if query == "miss" else f"ctx {query}"
+
+        with patch.object(enricher, "search_async", side_effect=fake_search):
+            asyncio.run(enricher.enrich_news_items_async(items, limit=3))
+
+        # First batch a/miss/b; one refill for the miss; "d" is never searched
+        assert batches == ["a", "miss", "b", "c"]
+        assert [i["summary"] for i in items] == [
+            "s\n\n**Web Context:**\nctx a",
+            "s",
+            "s",
+            "s\n\n**Web Context:**\nctx b",
+            "s\n\n**Web Context:**\nctx c",
+            "s",
+        ]
@@ -0,0 +1,76 @@
+"""Unit tests for the Discord webhook notifier."""
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from financial_news import notifier
+
+
+def _news(count: int) -> list[dict]:
+    return [
+        {
+            "title": f"Title {i}",
+            "link": f"https://example.vn/{i}",
+            "summary": "Summary",
+            "source": "CafeF",
+            "published_at": datetime.datetime(2026, 1, 1, 9, 0),
+        }
+        for i in range(count)
+    ]
+
+
+class TestSendDiscordWebhookAsync:
+    """Tests for send_discord_webhook_async."""
+
+    def test_summary_then_chunks_with_rate_limit_retry(self):
+        posts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            posts.append(request)
+            if len(posts) == 2:
+                return httpx.Response(429, json={"retry_after": 0.5})
+            return httpx.Response(204)
+
+        async def run() -> None:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                with patch.object(notifier, "get_async_client", return_value=client):
+                    await notifier.send_discord_webhook_async("https://hook.test", _news(7), "Hi")
+
+        with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            asyncio.run(run())
+
+        # Summary, then two embed chunks (5 + 2), one of which was retried
+        assert len(posts) == 4
+        assert b'"content"' in posts[0].content
+        mock_sleep.assert_awaited_once_with(0.5)
+
+    def test_persistent_rate_limit_raises_without_a_final_wait(self):
+        posts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            posts.append(request)
+            return httpx.Response(429, json={"retry_after": 600})
+
+        async def run() -> None:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                await notifier._post_to_discord_async(client, "https://hook.test", {"content": "x"})
+
+        with (
+            patch("asyncio.sleep", new=AsyncMock()) as mock_sleep,
+            pytest.raises(httpx.HTTPStatusError),
+        ):
+            asyncio.run(run())
+
+        assert len(posts) == notifier._MAX_RATE_LIMIT_RETRIES
+        # Capped, and no sleep after the last attempt
+        assert mock_sleep.await_count == notifier._MAX_RATE_LIMIT_RETRIES - 1
+        mock_sleep.assert_awaited_with(notifier._MAX_RETRY_AFTER)
+
+    def test_no_news_sends_nothing(self):
+        with patch.object(notifier, "get_async_client") as mock_client:
+            asyncio.run(notifier.send_discord_webhook_async("https://hook.test", [], "Hi"))
+        mock_client.assert_not_called()
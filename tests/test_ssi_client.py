@@ -1,5 +1,6 @@
 """Unit tests for SSI iBoard API client."""
 
+import json
 from unittest.mock import MagicMock, patch
 
 import httpx
@@ -71,6 +72,7 @@ def _make_ssi_client_with_mock(mock_response: MagicMock) -> SSIClient:
     mock_http = MagicMock()
     mock_http.get.return_value = mock_response
     client._client = mock_http
+    client._request_headers = None
     return client
 
 
@@ -81,13 +83,14 @@ def _make_ssi_client_with_error(error: Exception) -> SSIClient:
     mock_http = MagicMock()
     mock_http.get.side_effect = error
     client._client = mock_http
+    client._request_headers = None
     return client
 
 
 def _mock_response(json_data: dict) -> MagicMock:
     """Create a mock httpx response."""
     resp = MagicMock()
-    resp.json.return_value = json_data
+    resp.content = json.dumps(json_data).encode()
     resp.raise_for_status = MagicMock()
     return resp
 
@@ -148,6 +151,21 @@ class TestSSIStockData:
         assert stock.foreign_net_qtty == -70000
         assert stock.foreign_net_value == -2100000000
 
+    def test_from_api_maps_fields_in_order(self):
+        stock = SSIStockData.from_api(SAMPLE_STOCK_ITEM)
+        assert stock.stock_symbol == "VNM"
+        assert stock.company_name == "Vinamilk"
+        assert stock.price_change_percent == 0.69
+        assert stock.total_volume == 1500000
+        assert stock.sell_foreign_value == 2175000000
+        assert stock.best1_offer_vol == 3000
+
+    def test_from_api_defaults_missing_fields(self):
+        stock = SSIStockData.from_api({"stockSymbol": "FPT"})
+        assert stock.stock_symbol == "FPT"
+        assert stock.matched_price == 0
+        assert stock.best1_bid == 0
+
 
 # ---- SSIIndexData Tests ----
 
@@ -244,6 +262,16 @@ class TestSSIClientGetVN30Index:
         assert idx.declines == 7
         assert len(idx.history) == 2
 
+    def test_without_history_omits_query_flag(self):
+        """Snapshot-only requests should not ask for the tick history."""
+        resp = _mock_response(SAMPLE_INDEX_RESPONSE)
+        client = _make_ssi_client_with_mock(resp)
+
+        client.get_vn30_index(include_history=False)
+
+        url = client._client.get.call_args.args[0]
+        assert "hasHistory" not in url
+
     def test_timeout_returns_none(self):
         """Should return None on timeout."""
         client = _make_ssi_client_with_error(httpx.TimeoutException("Timeout"))
@@ -342,8 +370,8 @@ class TestSSIClientGetMarketSummary:
         # Top gainers (VNM +0.69%) should be first
         assert summary["top_gainers"][0]["symbol"] == "VNM"
 
-        # Top losers (HPG -1.64%) should be last
-        assert summary["top_losers"][-1]["symbol"] == "HPG"
+        # Top losers (HPG -1.64%) should be first
+        assert summary["top_losers"][0]["symbol"] == "HPG"
 
         # Top foreign buy (VNM net +20000)
         assert len(summary["top_foreign_buy"]) == 1
@@ -370,3 +398,30 @@ class TestSSIClientGetMarketSummary:
         assert summary["top_gainers"] == []
         assert summary["top_losers"] == []
         assert summary["foreign_summary"] == {}
+
+
+# ---- Injected client Tests ----
+
+
+class TestSSIClientInjectedClient:
+    """Tests for SSIClient with a caller-owned httpx.Client."""
+
+    def test_requests_carry_iboard_headers(self):
+        """A shared client has no iBoard defaults, so headers go per request."""
+        mock_http = MagicMock()
+        mock_http.get.return_value = _mock_response(SAMPLE_INDEX_RESPONSE)
+        client = SSIClient(client=mock_http)
+
+        client.get_vn30_index()
+
+        headers = mock_http.get.call_args.kwargs["headers"]
+        assert headers["origin"] == "https://iboard.ssi.com.vn"
+
+    def test_close_leaves_injected_client_open(self):
+        """Closing the SSIClient must not close a client it does not own."""
+        mock_http = MagicMock()
+        client = SSIClient(client=mock_http)
+
+        client.close()
+
+        mock_http.close.assert_not_called()
@@ -0,0 +1,83 @@
+"""Unit tests for StockClient's caches and price fetching."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bot_common.disk_cache import DiskTTLCache
+from bot_common.ttl_cache import TTLCache
+from financial_news.dsc_client import StockData
+from financial_news.stock_client import StockClient
+
+
+@pytest.fixture(autouse=True)
+def _isolated_symbols_cache(tmp_path):
+    disk_cache = DiskTTLCache(str(tmp_path / "vn30_symbols.json"), ttl=3600)
+    with (
+        patch("financial_news.stock_client._VN30_SYMBOLS_CACHE", disk_cache),
+        patch("financial_news.stock_client._STOCK_INFO_CACHE", TTLCache()),
+    ):
+        yield disk_cache
+
+
+class TestVN30SymbolsCache:
+    """Tests for reusing the VN30 components across runs."""
+
+    def test_fetched_symbols_are_reused_by_the_next_client(self):
+        first = StockClient()
+        with patch.object(first.dsc_client, "get_vn30_symbols", return_value=["VNM", "FPT"]):
+            assert first.get_vn30_symbols() == {"VNM", "FPT"}
+
+        second = StockClient()
+        with patch.object(second.dsc_client, "get_vn30_symbols") as mock_fetch:
+            assert second.get_vn30_symbols() == {"VNM", "FPT"}
+        mock_fetch.assert_not_called()
+
+    def test_failed_fetch_is_not_persisted(self, _isolated_symbols_cache):
+        client = StockClient()
+        with patch.object(client.dsc_client, "get_vn30_symbols", return_value=[]):
+            assert client.get_vn30_symbols() == set()
+
+        assert _isolated_symbols_cache.get("vn30") is None
+
+
+class TestStockInfoCache:
+    """Tests for the in-process fundamentals cache."""
+
+    def test_info_is_reused_across_clients_and_failures_are_not_cached(self):
+        info = {"symbol": "FPT", "company_name": "FPT Corp", "is_vn30": True}
+        first = StockClient()
+        with (
+            patch.object(first, "get_vn30_symbols", return_value={"FPT"}),
+            patch.object(first.dsc_client, "get_stock_info", side_effect=[None, info]),
+        ):
+            assert first.get_stock_info("FPT") is None
+            assert first.get_stock_info("fpt").company_name == "FPT Corp"
+
+        second = StockClient()
+        with patch.object(second.dsc_client, "get_stock_info") as mock_fetch:
+            assert second.get_stock_info("FPT").is_vn30 is True
+        mock_fetch.assert_not_called()
+
+
+class TestStockPrices:
+    """Tests for the per-symbol fallback behind the batch quote call."""
+
+    def test_missing_symbols_fall_back_and_one_failure_is_isolated(self):
+        client = StockClient()
+        batch = MagicMock(status_code=200)
+        batch.json.return_value = {"d": []}
+
+        def fetch(symbol):
+            if symbol == "BAD":
+                raise RuntimeError("boom")
+            return StockData(symbol, 10.0, 9.0, 1.0, 11.11, 100, "10:00:00")
+
+        with (
+            patch.object(client.dsc_client.client, "get", return_value=batch),
+            patch.object(client.dsc_client, "get_stock_price", side_effect=fetch) as mock_fetch,
+        ):
+            prices = client.get_stock_prices(["VNM", "BAD", "FPT"])
+
+        assert set(prices) == {"VNM", "FPT"}
+        assert prices["FPT"].price == 10.0
+        assert mock_fetch.call_count == 3
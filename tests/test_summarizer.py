@@ -0,0 +1,116 @@
+"""Unit tests for NewsSummarizer batching and Z.AI calls."""
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from financial_news.summarizer import _SUMMARY_CACHE, NewsSummarizer, _is_retryable
+
+NEWS = [{"source": "CafeF", "title": "VN30 tăng", "summary": "Thị trường tăng điểm"}]
+OTHER_NEWS = [{"source": "VnExpress", "title": "Vàng giảm", "summary": ""}]
+
+
+def _make_summarizer() -> NewsSummarizer:
+    summarizer = NewsSummarizer()
+    summarizer.api_key = "test-key"
+    return summarizer
+
+
+@pytest.fixture(autouse=True)
+def _clear_summary_cache():
+    _SUMMARY_CACHE.clear()
+
+
+class TestSummarize:
+    """Tests for NewsSummarizer.summarize."""
+
+    def test_identical_inputs_reuse_the_cached_summary(self):
+        with patch.object(NewsSummarizer, "_call_zai_api", return_value="Tóm tắt") as mock_call:
+            first = _make_summarizer().summarize(NEWS, {})
+            second = _make_summarizer().summarize(NEWS, {})
+
+        assert first == second == "Tóm tắt"
+        assert mock_call.call_count == 1
+
+    def test_different_inputs_call_the_api(self):
+        with patch.object(NewsSummarizer, "_call_zai_api", return_value="x") as mock_call:
+            _make_summarizer().summarize(NEWS, {})
+            _make_summarizer().summarize(OTHER_NEWS, {})
+
+        assert mock_call.call_count == 2
+
+
+class TestSplitBriefings:
+    """Tests for NewsSummarizer._split_briefings."""
+
+    def test_splits_in_marker_order(self):
+        text = "---BRIEFING 1---\nMột\n---BRIEFING 2---\nHai\n"
+        assert NewsSummarizer._split_briefings(text, 2) == ["Một", "Hai"]
+
+    def test_missing_briefing_returns_none(self):
+        assert NewsSummarizer._split_briefings("---BRIEFING 1---\nMột", 2) is None
+
+
+class TestSummarizeBatch:
+    """Tests for NewsSummarizer.summarize_batch."""
+
+    def test_one_request_for_a_small_batch(self):
+        summarizer = _make_summarizer()
+        reply = "---BRIEFING 1---\nA\n---BRIEFING 2---\nB"
+        with patch.object(summarizer, "_call_zai_api", return_value=reply) as mock_call:
+            result = summarizer.summarize_batch([(NEWS, {}), ([], {}), (NEWS, None)])
+
+        assert result == ["A", "", "B"]
+        assert mock_call.call_count == 1
+
+    def test_malformed_reply_falls_back_to_single_calls(self):
+        summarizer = _make_summarizer()
+        replies = ["no markers here", "A", "B"]
+        with patch.object(summarizer, "_call_zai_api", side_effect=replies) as mock_call:
+            result = summarizer.summarize_batch([(NEWS, {}), (OTHER_NEWS, {})])
+
+        assert result == ["A", "B"]
+        assert mock_call.call_count == 3
+
+
+class TestCallZaiApi:
+    """Tests for the streamed Z.AI completion call."""
+
+    @staticmethod
+    def _call_with(handler) -> str:
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("financial_news.summarizer._ZAI_CLIENT", client):
+            return _make_summarizer()._call_zai_api([{"role": "user", "content": "hi"}])
+
+    def test_accumulates_stream_deltas(self):
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            events = [{"choices": [{"delta": {"content": c}}]} for c in ("Xin ", "chào ")]
+            body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, text=body)
+
+        assert self._call_with(handler) == "Xin chào"
+
+    def test_plain_json_reply_is_accepted(self):
+        def handler(request):
+            return httpx.Response(200, json={"choices": [{"message": {"content": " ok "}}]})
+
+        assert self._call_with(handler) == "ok"
+
+
+class TestIsRetryable:
+    """Tests for the Z.AI retry predicate."""
+
+    @pytest.mark.parametrize(("status", "expected"), [(429, True), (503, True), (401, False)])
+    def test_status_errors(self, status, expected):
+        request = httpx.Request("POST", "https://api.z.ai/chat/completions")
+        response = httpx.Response(status, request=request)
+        error = httpx.HTTPStatusError("error", request=request, response=response)
+        assert _is_retryable(error) is expected
+
+    def test_timeouts_are_retried(self):
+        assert _is_retryable(httpx.ReadTimeout("timed out"))
+
+    def test_other_exceptions_are_not_retried(self):
+        assert not _is_retryable(KeyError("choices"))
@@ -0,0 +1,51 @@
+"""Unit tests for the shared TTL cache."""
+
+from unittest.mock import patch
+
+from bot_common.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_returns_stored_value_and_counts_hit(self):
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+    def test_missing_key_returns_default_and_counts_miss(self):
+        cache = TTLCache()
+
+        assert cache.get("missing", "fallback") == "fallback"
+        assert cache.misses == 1
+
+    def test_entry_expires_after_ttl(self):
+        cache = TTLCache(ttl=10)
+        with patch("bot_common.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("bot_common.ttl_cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_overrides_default(self):
+        cache = TTLCache(ttl=10)
+        with patch("bot_common.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("short", 1, ttl=1)
+            cache.set("long", 2)
+        with patch("bot_common.ttl_cache.time.monotonic", return_value=105.0):
+            assert cache.get("short") is None
+            assert cache.get("long") == 2
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3